@@ -5,9 +5,27 @@ Interactive Q-Learning Agent Test
 Watch the Q-learning agent make decisions in real-time
 """
 
-from tictactoe_ai import TicTacToeAI, Strategy
+from tictactoe_ai import TicTacToeAI, Strategy, encode_board
+import os
 import time
 
+# Set TICTACTOE_INTERACTIVE=0 for automated runs: no pauses or "Press Enter" prompts
+INTERACTIVE = os.environ.get('TICTACTOE_INTERACTIVE', '1') == '1'
+_SLEEP = time.sleep if INTERACTIVE else (lambda _: None)
+
+DEMO_POSITIONS = [
+    ("         ", "Empty board"),
+    ("X        ", "After opening move"),
+    ("X   O    ", "Early game"),
+    ("XX O     ", "Two in a row threat"),
+    ("XOX      ", "Blocked line"),
+    ("X O   O  ", "Multiple threats")
+]
+
+# Encoded state and available moves for each demo position, computed once at import
+_DEMO_POSITIONS = [(encode_board(state), [i for i, c in enumerate(state) if c == ' '], state, description)
+                   for state, description in DEMO_POSITIONS]
+
 def interactive_q_learning_demo():
     print("🎮 INTERACTIVE Q-LEARNING DEMONSTRATION")
     print("=" * 50)
@@ -64,69 +82,62 @@ def play_interactive_game(ai, opponent_strategy, opponent_name):
     
     print("🎯 Game starting... Q-Learning plays as X")
     
-    while ai.gameState.status == 'playing':
+    winner = None
+    while winner is None:
         move_count += 1
         print(f"\n--- Move {move_count} ---")
         
         # Show current board
         ai.print_board()
         
-        current_player = ai.gameState.currentPlayer
+        current_player = ai.current_player
         if current_player == 'X':  # Q-Learning turn
             print("🧠 Q-Learning Agent thinking...")
             
             # Show Q-values for available moves
-            state = ''.join(ai.gameState.board)
-            available_moves = ai.get_available_moves()
+            state, available_moves = ai.get_cached_state()
             
             print("📊 Q-values for available moves:")
-            q_values = []
-            for move in available_moves:
-                q_value = ai.q_agent_x.get_q_value(state, move)
-                q_values.append((move, q_value))
+            q_values = ai.q_agent_x.get_q_values(state)[available_moves]
+            for move, q_value in zip(available_moves, q_values):
                 print(f"   Position {move}: {q_value:.3f}")
             
             # Find best move
-            best_move = max(q_values, key=lambda x: x[1])
-            print(f"🎯 Best move: Position {best_move[0]} (Q-value: {best_move[1]:.3f})")
+            best = int(q_values.argmax())
+            print(f"🎯 Best move: Position {available_moves[best]} (Q-value: {q_values[best]:.3f})")
             
             # Make the move
-            time.sleep(1)  # Dramatic pause
+            _SLEEP(1)  # Dramatic pause
             move = ai.get_move_by_strategy('X', Strategy.Q_LEARNING)
             ai.make_move(move, 'X')
             print(f"✅ Q-Learning plays position {move}")
             
         else:  # Opponent turn
             print(f"🎲 {opponent_name} thinking...")
-            time.sleep(0.5)
+            _SLEEP(0.5)
             move = ai.get_move_by_strategy('O', opponent_strategy)
             ai.make_move(move, 'O')
             print(f"✅ {opponent_name} plays position {move}")
         
-        # Check for game end
+        # Check for game end (check_winner also reports a full board as 'Tie')
         winner = ai.check_winner()
-        if winner:
-            ai.gameState.status = 'won' if winner != 'Tie' else 'tie'
-            ai.gameState.winner = winner
-        elif ' ' not in ai.gameState.board:
-            ai.gameState.status = 'tie'
-            ai.gameState.winner = 'Tie'
         
         # Switch players
-        ai.gameState.currentPlayer = 'O' if current_player == 'X' else 'X'
+        ai.current_player = 'O' if current_player == 'X' else 'X'
     
     # Show final result
     print("\n🏁 GAME OVER!")
     ai.print_board()
     
-    if ai.gameState.winner == 'X':
+    if winner == 'X':
         print("🎉 Q-Learning Agent WINS!")
-    elif ai.gameState.winner == 'O':
+    elif winner == 'O':
         print(f"😔 {opponent_name} wins!")
     else:
         print("🤝 It's a TIE!")
     
-    input("\nPress Enter to continue...")
+    if INTERACTIVE:
+        input("\nPress Enter to continue...")
 
 def additional_training(ai):
     print("\n🎓 Additional Training Session")
@@ -155,32 +166,20 @@ def show_q_values_demo(ai):
     print("-" * 30)
     
     # Show Q-values for some interesting positions
-    demo_positions = [
-        ("         ", "Empty board"),
-        ("X        ", "After opening move"),
-        ("X   O    ", "Early game"),
-        ("XX O     ", "Two in a row threat"),
-        ("XOX      ", "Blocked line"),
-        ("X O   O  ", "Multiple threats")
-    ]
-    
-    for state, description in demo_positions:
+    for state_key, available_moves, state, description in _DEMO_POSITIONS:
         print(f"\n{description}: {state}")
-        available_moves = [i for i in range(9) if state[i] == ' ']
         
         if available_moves:
             print("Q-values for available moves:")
-            q_values = []
-            for move in available_moves:
-                q_value = ai.q_agent_x.get_q_value(state, move)
-                q_values.append((move, q_value))
+            q_values = ai.q_agent_x.get_q_values(state_key)[available_moves]
+            for move, q_value in zip(available_moves, q_values):
                 print(f"  Position {move}: {q_value:7.3f}")
             
-            if q_values:
-                best_move = max(q_values, key=lambda x: x[1])
-                print(f"🎯 Best choice: Position {best_move[0]} ({best_move[1]:.3f})")
+            best = int(q_values.argmax())
+            print(f"🎯 Best choice: Position {available_moves[best]} ({q_values[best]:.3f})")
     
-    input("\nPress Enter to continue...")
+    if INTERACTIVE:
+        input("\nPress Enter to continue...")
 
 if __name__ == "__main__":
     try:
@@ -8,16 +8,177 @@ Generates massive datasets for machine learning and AI research
 import multiprocessing as mp
 import os
 import sys
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 import threading
 from queue import Queue
-import gc
-from collections import defaultdict
-from tictactoe_ai import TicTacToeAI, Strategy, GameRecord, GameplayDataCollector
+import shutil
+import tempfile
+import numpy as np
+from dataclasses import replace
+from operator import attrgetter
+from tictactoe_ai import (TicTacToeAI, Strategy, GameRecord, GameplayDataCollector, GameRecordPool,
+                         STRATEGIES, STRAT_ID, NUM_STRATEGIES, WINNER_ID, CSV_BUFFER_SIZE, is_deterministic,
+                         pack_moves, write_json)
 import time
 from datetime import datetime
-import json
 import csv
+import logging
+
+class RateLimitedHandler(logging.StreamHandler):
+    """Stream handler that emits at most one record per interval and drops the rest
+    
+    Records logged with extra={'unthrottled': True} are always emitted. Without an explicit
+    stream it writes to whatever sys.stdout is at emit time, so later redirection is honoured.
+    """
+    
+    def __init__(self, stream=None, interval: float = 1.0):
+        super().__init__(stream)
+        self._stream = stream
+        self.interval = interval
+        self._last_emit = -float('inf')
+    
+    @property
+    def stream(self):
+        return sys.stdout if self._stream is None else self._stream
+    
+    @stream.setter
+    def stream(self, stream):
+        self._stream = stream
+    
+    def emit(self, record: logging.LogRecord):
+        if getattr(record, 'unthrottled', False):
+            super().emit(record)
+            return
+        now = time.monotonic()
+        if now - self._last_emit < self.interval:
+            return
+        self._last_emit = now
+        super().emit(record)
+
+# Progress inside the generation and export loops goes through this logger so a
+# fast batch rate never turns into a stream of terminal writes; the final record of
+# each loop is logged unthrottled so the last count is always shown
+logger = logging.getLogger(__name__)
+
+def configure_progress_logging(interval: float = 1.0):
+    """Print this module's progress to stdout, at most one record per interval (done by the script entry point)"""
+    if any(isinstance(handler, RateLimitedHandler) for handler in logger.handlers):
+        return
+    handler = RateLimitedHandler(interval=interval)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+CSV_FIELDNAMES = ['game_id', 'player_x_strategy', 'player_o_strategy',
+                  'winner', 'game_length', 'timestamp', 'moves_packed']
+CSV_LINE_TERMINATOR = '\r\n'  # csv.writer's default
+
+def game_to_csv_line(game: GameRecord) -> str:
+    """Format a game record as one CSV line in CSV_FIELDNAMES order
+    
+    Moves are written as the 12-hex-digit pack_moves value (decode with
+    unpack_moves and game_length). No field can contain a comma or quote,
+    so no CSV quoting is needed.
+    """
+    return (f"{game.game_id},{game.player_x_strategy},{game.player_o_strategy},"
+            f"{game.winner},{game.game_length},{game.timestamp_iso()},{pack_moves(game.moves):012x}")
+
+def write_csv_lines(csvfile, games: list):
+    """Write a chunk of game records with a single write() call"""
+    if games:
+        csvfile.write(CSV_LINE_TERMINATOR.join(map(game_to_csv_line, games)) + CSV_LINE_TERMINATOR)
+
+def game_columns(games: list) -> dict:
+    """Extract the per-game fields used by the analysis as NumPy columns"""
+    num_games = len(games)
+    return {
+        'x_strat': np.fromiter(map(STRAT_ID.__getitem__, map(attrgetter('player_x_strategy'), games)),
+                               dtype=np.int8, count=num_games),
+        'o_strat': np.fromiter(map(STRAT_ID.__getitem__, map(attrgetter('player_o_strategy'), games)),
+                               dtype=np.int8, count=num_games),
+        'winner': np.fromiter(map(WINNER_ID.__getitem__, map(attrgetter('winner'), games)),
+                              dtype=np.int8, count=num_games),
+        'game_length': np.fromiter(map(attrgetter('game_length'), games), dtype=np.int64, count=num_games),
+        'first_move': np.fromiter((g.moves[0][0] if g.moves else -1 for g in games),
+                                  dtype=np.int64, count=num_games)
+    }
+
+# Worker-local engine, built once per process by _init_worker and reused across batches,
+# and the record pool used while a batch is written to its shard
+_AI = None
+_RECORD_POOL = None
+
+def _init_worker(log_progress: bool = False):
+    """Create the persistent TicTacToeAI for this worker process"""
+    global _AI, _RECORD_POOL
+    if log_progress:
+        # Spawned workers do not inherit the parent's handler
+        configure_progress_logging()
+    # Forked workers inherit the parent's RNG state; give each engine its own stream
+    # so parallel batches don't replay identical games (logged so a run can be reproduced)
+    seed = os.getpid() ^ time.time_ns()
+    logger.info("   Worker %d RNG seed: %d", os.getpid(), seed, extra={'unthrottled': True})
+    _AI = TicTacToeAI(Strategy.RANDOM, Strategy.RANDOM, seed=seed)
+    _RECORD_POOL = GameRecordPool()
+
+def generate_game_batch(strategy_pair: tuple, num_games: int, first_game_id: int, pooled: bool = False) -> list:
+    """Generate a batch of games on the worker's persistent TicTacToeAI
+    
+    With pooled=True the records are rented from the worker's pool and the caller must
+    release them; otherwise they are plain records the caller may keep.
+    """
+    if _AI is None:
+        _init_worker()
+    _AI.record_pool = _RECORD_POOL if pooled else None
+    _AI.set_strategies(*strategy_pair)
+    _AI.data_collector.games_data.clear()
+    _AI.data_collector.current_game_id = first_game_id
+    # Every game of a deterministic pair repeats the first one
+    repeat_first = is_deterministic(strategy_pair[0]) and is_deterministic(strategy_pair[1])
+    
+    for i in range(num_games):
+        if repeat_first and i:
+            _AI.record_game_copy(_AI.data_collector.games_data[0])
+        else:
+            _AI.play_self_game(collect_data=True)
+    
+    return list(_AI.data_collector.games_data)
+
+def generate_game_shard(strategy_pair: tuple, num_games: int, first_game_id: int,
+                        shard_path: str, sample_size: int) -> tuple:
+    """Generate a batch of games straight into a headerless CSV shard
+    
+    Returns (shard_path, analysis columns, first sample_size games) so the
+    parent process never has to hold the full batch in memory.
+    """
+    games = generate_game_batch(strategy_pair, num_games, first_game_id, pooled=True)
+    with open(shard_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as shard:
+        write_csv_lines(shard, games)
+    columns = game_columns(games)
+    
+    # Pooled records are recycled by the next batch, so only copies may leave
+    sample = [replace(game, moves=list(game.moves)) for game in games[:sample_size]]
+    _AI.data_collector.games_data.clear()
+    _RECORD_POOL.release(games)
+    return shard_path, columns, sample
+
+class InlineExecutor:
+    """Executor stand-in that runs each submitted task immediately in this process"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
 
 class LargeScaleTrainingGenerator:
     """Large-scale training data generator with parallel processing"""
@@ -26,26 +187,17 @@ class LargeScaleTrainingGenerator:
         self.max_workers = max_workers or mp.cpu_count()
         self.data_collector = GameplayDataCollector()
         self.batch_size = 1000  # Games per batch
+        self.sample_size = 100  # Streamed games kept in memory for the JSON sample
         self.total_games_generated = 0
+        self.shard_dir = None
+        self.shard_paths = []  # Worker-written CSV shards awaiting export
+        self.batch_columns = []  # Analysis columns of the streamed batches
+        self._stats_cache = None
+        self._stats_cache_key = None
         
     def generate_game_batch(self, strategy_pair: tuple, num_games: int, batch_id: int) -> list:
-        """Generate a batch of games in a separate process"""
-        ai = TicTacToeAI(strategy_pair[0], strategy_pair[1])
-        batch_games = []
-        
-        for i in range(num_games):
-            game_id = batch_id * self.batch_size + i
-            ai.data_collector.current_game_id = game_id
-            
-            # Play game and collect data
-            winner = ai.play_self_game(collect_data=True)
-            
-            # Get the recorded game
-            if ai.data_collector.games_data:
-                game_record = ai.data_collector.games_data[-1]
-                batch_games.append(game_record)
-        
-        return batch_games
+        """Generate a batch of games in the current process"""
+        return generate_game_batch(strategy_pair, num_games, batch_id * self.batch_size)
     
     def generate_massive_dataset(self, 
                                strategy_combinations: list,
@@ -66,22 +218,41 @@ class LargeScaleTrainingGenerator:
         print(f"  Parallel workers: {self.max_workers}")
         print(f"  Batch size: {self.batch_size}")
         
-        start_time = time.time()
-        all_games = []
+        start_time = time.perf_counter()
         
-        # Process each strategy combination
-        for combo_idx, (strat_x, strat_o) in enumerate(strategy_combinations):
-            print(f"\n🎯 Processing combination {combo_idx + 1}/{total_combinations}")
-            print(f"   {strat_x.value} vs {strat_o.value}")
-            
-            combo_start = time.time()
-            combo_games = []
-            
-            # Calculate batches needed
-            num_batches = (games_per_combination + self.batch_size - 1) // self.batch_size
-            
-            # Generate batches in parallel
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+        # Games are streamed to per-batch CSV shards; only a small sample and the
+        # analysis columns are kept in memory
+        self.data_collector.games_data = []
+        self.total_games_generated = 0
+        self.shard_dir = tempfile.mkdtemp(prefix="tictactoe_shards_")
+        self.shard_paths = []
+        self.batch_columns = []
+        self._stats_cache = None
+        
+        # Combinations run one after another, so with a single batch per combination
+        # a process pool adds spawn and pickling cost without any parallelism
+        if games_per_combination <= self.batch_size or self.max_workers == 1:
+            print("  Running batches in-process (one batch per combination)")
+            executor = InlineExecutor()
+        else:
+            # One pool for the whole run so each worker keeps its TicTacToeAI across batches
+            log_progress = any(isinstance(handler, RateLimitedHandler) for handler in logger.handlers)
+            executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                           initargs=(log_progress,))
+        
+        with executor:
+            # Process each strategy combination
+            for combo_idx, (strat_x, strat_o) in enumerate(strategy_combinations):
+                print(f"\n🎯 Processing combination {combo_idx + 1}/{total_combinations}")
+                print(f"   {strat_x.value} vs {strat_o.value}")
+                
+                combo_start = time.perf_counter()
+                combo_games = 0
+                
+                # Calculate batches needed
+                num_batches = (games_per_combination + self.batch_size - 1) // self.batch_size
+                
+                # Generate batches in parallel
                 futures = []
                 
                 for batch_idx in range(num_batches):
@@ -89,40 +260,41 @@ class LargeScaleTrainingGenerator:
                                        games_per_combination - batch_idx * self.batch_size)
                     
                     if games_in_batch > 0:
+                        batch_id = combo_idx * num_batches + batch_idx
                         future = executor.submit(
-                            self.generate_game_batch,
+                            generate_game_shard,
                             (strat_x, strat_o),
                             games_in_batch,
-                            combo_idx * num_batches + batch_idx
+                            batch_id * self.batch_size,
+                            os.path.join(self.shard_dir, f"shard_{batch_id}.csv"),
+                            self.sample_size
                         )
                         futures.append(future)
                 
                 # Collect results
                 completed_batches = 0
                 for future in as_completed(futures):
-                    batch_games = future.result()
-                    combo_games.extend(batch_games)
+                    shard_path, columns, sample = future.result()
+                    self.shard_paths.append(shard_path)
+                    self.batch_columns.append(columns)
+                    sample_room = self.sample_size - len(self.data_collector.games_data)
+                    if sample_room > 0:
+                        self.data_collector.games_data.extend(sample[:sample_room])
+                    combo_games += len(columns['winner'])
                     completed_batches += 1
-                    
-                    if completed_batches % 5 == 0:
-                        progress = completed_batches / len(futures) * 100
-                        elapsed = time.time() - combo_start
-                        print(f"     Batch progress: {completed_batches}/{len(futures)} ({progress:.1f}%) - {elapsed:.1f}s")
-            
-            all_games.extend(combo_games)
-            combo_time = time.time() - combo_start
-            games_per_sec = len(combo_games) / combo_time
-            
-            print(f"   ✅ Completed: {len(combo_games):,} games in {combo_time:.1f}s ({games_per_sec:.1f} games/sec)")
-            
-            # Periodic garbage collection for memory management
-            gc.collect()
-        
-        # Store all games in data collector
-        self.data_collector.games_data = all_games
-        self.total_games_generated = len(all_games)
+                    logger.info("     Batch progress: %d/%d (%.1f%%) - %.1fs",
+                                completed_batches, len(futures),
+                                completed_batches / len(futures) * 100,
+                                time.perf_counter() - combo_start,
+                                extra={'unthrottled': completed_batches == len(futures)})
+                
+                self.total_games_generated += combo_games
+                combo_time = time.perf_counter() - combo_start
+                games_per_sec = combo_games / combo_time
+                
+                print(f"   ✅ Completed: {combo_games:,} games in {combo_time:.1f}s ({games_per_sec:.1f} games/sec)")
         
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         overall_rate = self.total_games_generated / total_time
         
         print(f"\n🎉 GENERATION COMPLETED!")
@@ -132,6 +304,7 @@ class LargeScaleTrainingGenerator:
         
         # Export data
         self.export_massive_dataset(output_prefix)
+        self.cleanup_shards()
         
         # Generate comprehensive statistics
         stats = self.analyze_massive_dataset()
@@ -163,150 +336,163 @@ class LargeScaleTrainingGenerator:
     
     def export_chunked_csv(self, filename: str, chunk_size: int = 10000):
         """Export CSV in chunks to handle large datasets efficiently"""
-        with open(filename, 'w', newline='') as csvfile:
-            fieldnames = ['game_id', 'player_x_strategy', 'player_o_strategy', 
-                         'winner', 'game_length', 'timestamp', 'moves_sequence']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+        if self.shard_paths:
+            self.concatenate_shards(filename)
+            return
+        
+        with open(filename, 'w', newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_FIELDNAMES)
             
             for i in range(0, len(self.data_collector.games_data), chunk_size):
                 chunk = self.data_collector.games_data[i:i + chunk_size]
-                
-                for game in chunk:
-                    moves_str = ';'.join([f"{state},{move},{player}" 
-                                        for state, move, player in game.moves])
-                    writer.writerow({
-                        'game_id': game.game_id,
-                        'player_x_strategy': game.player_x_strategy,
-                        'player_o_strategy': game.player_o_strategy,
-                        'winner': game.winner,
-                        'game_length': game.game_length,
-                        'timestamp': game.timestamp,
-                        'moves_sequence': moves_str
-                    })
+                write_csv_lines(csvfile, chunk)
                 
                 # Progress indicator
                 progress = min(i + chunk_size, len(self.data_collector.games_data))
-                print(f"   CSV export progress: {progress:,}/{len(self.data_collector.games_data):,}")
+                logger.info("   CSV export progress: %s/%s", f"{progress:,}",
+                            f"{len(self.data_collector.games_data):,}",
+                            extra={'unthrottled': progress == len(self.data_collector.games_data)})
+    
+    def concatenate_shards(self, filename: str):
+        """Write the streamed CSV shards out as a single CSV file"""
+        with open(filename, 'w', newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+            csv.writer(csvfile).writerow(CSV_FIELDNAMES)
+            
+            for i, shard_path in enumerate(self.shard_paths):
+                with open(shard_path, newline='') as shard:
+                    shutil.copyfileobj(shard, csvfile)
+                
+                # Progress indicator
+                logger.info("   CSV export progress: %d/%d shards", i + 1, len(self.shard_paths),
+                            extra={'unthrottled': i + 1 == len(self.shard_paths)})
+    
+    def cleanup_shards(self):
+        """Delete the streamed CSV shards once they have been exported"""
+        if self.shard_dir:
+            shutil.rmtree(self.shard_dir, ignore_errors=True)
+        self.shard_dir = None
+        self.shard_paths = []
+    
+    def dataset_columns(self) -> dict:
+        """Get the analysis columns for every generated game"""
+        if self.batch_columns:
+            return {key: np.concatenate([columns[key] for columns in self.batch_columns])
+                    for key in self.batch_columns[0]}
+        return game_columns(self.data_collector.games_data)
     
     def export_metadata_json(self, filename: str, sample_size: int = 100):
         """Export metadata and sample games to JSON"""
-        strategies_used = list(set([g.player_x_strategy for g in self.data_collector.games_data] + 
-                                 [g.player_o_strategy for g in self.data_collector.games_data]))
+        columns = self.dataset_columns()
+        used = np.zeros(NUM_STRATEGIES, dtype=bool)
+        used[columns['x_strat']] = True
+        used[columns['o_strat']] = True
+        strategies_used = [STRATEGIES[i].value for i in np.flatnonzero(used)]
         
         # Sample games for JSON (to avoid huge files)
         sample_games = self.data_collector.games_data[:sample_size]
         
         metadata = {
             'generation_info': {
-                'total_games': len(self.data_collector.games_data),
+                'total_games': len(columns['winner']),
                 'export_timestamp': datetime.now().isoformat(),
                 'strategies_used': strategies_used,
                 'sample_size': len(sample_games)
             },
-            'sample_games': [
-                {
-                    'game_id': game.game_id,
-                    'player_x_strategy': game.player_x_strategy,
-                    'player_o_strategy': game.player_o_strategy,
-                    'moves': [{'board_state': state, 'move': move, 'player': player} 
-                             for state, move, player in game.moves],
-                    'winner': game.winner,
-                    'game_length': game.game_length,
-                    'timestamp': game.timestamp
-                } for game in sample_games
-            ]
+            'sample_games': [game.to_dict() for game in sample_games]
         }
         
-        with open(filename, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        write_json(filename, metadata)
     
     def export_summary(self, filename: str):
         """Export comprehensive summary statistics"""
         stats = self.analyze_massive_dataset()
         
-        with open(filename, 'w') as f:
-            json.dump(stats, f, indent=2)
+        write_json(filename, stats)
     
     def analyze_massive_dataset(self) -> dict:
+        """Analyze the massive dataset, reusing the result until the dataset changes"""
+        cache_key = (self.total_games_generated, len(self.batch_columns),
+                     len(self.data_collector.games_data))
+        if self._stats_cache is None or self._stats_cache_key != cache_key:
+            self._stats_cache = self._compute_statistics()
+            self._stats_cache_key = cache_key
+        return self._stats_cache
+    
+    def _compute_statistics(self) -> dict:
         """Analyze the massive dataset for comprehensive statistics"""
-        if not self.data_collector.games_data:
+        # Columnar view of the dataset so every statistic is a single NumPy reduction
+        columns = self.dataset_columns()
+        num_games = len(columns['winner'])
+        if not num_games:
             return {"error": "No games in dataset"}
         
-        print(f"\n🔍 Analyzing massive dataset ({len(self.data_collector.games_data):,} games)...")
+        print(f"\n🔍 Analyzing massive dataset ({num_games:,} games)...")
+        
+        x_strat = columns['x_strat']
+        o_strat = columns['o_strat']
+        winner = columns['winner']
+        game_length = columns['game_length']
+        first_move = columns['first_move']
+        
+        x_won = winner == WINNER_ID['X']
+        o_won = winner == WINNER_ID['O']
+        
+        # Strategy performance: perf[strategy_id] = (games, wins)
+        perf = np.zeros((NUM_STRATEGIES, 2), dtype=np.int64)
+        perf[:, 0] = (np.bincount(x_strat, minlength=NUM_STRATEGIES) +
+                      np.bincount(o_strat, minlength=NUM_STRATEGIES))
+        perf[:, 1] = (np.bincount(x_strat[x_won], minlength=NUM_STRATEGIES) +
+                      np.bincount(o_strat[o_won], minlength=NUM_STRATEGIES))
+        
+        # Matchup matrix: matchup[x_id, o_id] = (X wins, O wins, ties)
+        matchup = np.bincount((x_strat.astype(np.int64) * NUM_STRATEGIES + o_strat) * 3 + winner,
+                              minlength=NUM_STRATEGIES * NUM_STRATEGIES * 3)
+        matchup = matchup.reshape(NUM_STRATEGIES, NUM_STRATEGIES, 3)
         
         stats = {
             'dataset_info': {
-                'total_games': len(self.data_collector.games_data),
+                'total_games': num_games,
                 'analysis_timestamp': datetime.now().isoformat()
             },
-            'strategy_performance': defaultdict(lambda: {'games': 0, 'wins': 0, 'win_rate': 0.0}),
-            'matchup_matrix': defaultdict(lambda: {'X_wins': 0, 'O_wins': 0, 'ties': 0, 'total': 0}),
+            'strategy_performance': {},
+            'matchup_matrix': {},
             'game_characteristics': {
-                'length_distribution': defaultdict(int),
-                'average_length': 0.0,
-                'opening_moves': defaultdict(int),
-                'winning_patterns': defaultdict(int)
+                'length_distribution': _count_values(game_length),
+                'average_length': float(game_length.mean()),
+                'opening_moves': _count_values(first_move[first_move >= 0]),
+                'winning_patterns': _count_values(game_length[winner != WINNER_ID['Tie']])
             }
         }
         
-        total_length = 0
+        # Convert to JSON-friendly dicts in first-seen order (strategies as X then O of each game),
+        # which skips strategies and matchups never played
+        for i in _first_seen(np.column_stack((x_strat, o_strat)).ravel()):
+            games, wins = perf[i].tolist()
+            stats['strategy_performance'][STRATEGIES[i].value] = {
+                'games': games, 'wins': wins, 'win_rate': wins / games * 100
+            }
         
-        for game in self.data_collector.games_data:
-            # Strategy performance
-            x_strat = game.player_x_strategy
-            o_strat = game.player_o_strategy
-            
-            stats['strategy_performance'][x_strat]['games'] += 1
-            stats['strategy_performance'][o_strat]['games'] += 1
-            
-            if game.winner == 'X':
-                stats['strategy_performance'][x_strat]['wins'] += 1
-            elif game.winner == 'O':
-                stats['strategy_performance'][o_strat]['wins'] += 1
-            
-            # Matchup matrix
-            matchup = f"{x_strat}_vs_{o_strat}"
-            stats['matchup_matrix'][matchup]['total'] += 1
-            
-            if game.winner == 'X':
-                stats['matchup_matrix'][matchup]['X_wins'] += 1
-            elif game.winner == 'O':
-                stats['matchup_matrix'][matchup]['O_wins'] += 1
-            else:
-                stats['matchup_matrix'][matchup]['ties'] += 1
-            
-            # Game characteristics
-            stats['game_characteristics']['length_distribution'][game.game_length] += 1
-            total_length += game.game_length
-            
-            # Opening moves
-            if game.moves:
-                first_move = game.moves[0][1]
-                stats['game_characteristics']['opening_moves'][first_move] += 1
-            
-            # Winning patterns (game length for wins)
-            if game.winner != 'Tie':
-                stats['game_characteristics']['winning_patterns'][game.game_length] += 1
-        
-        # Calculate win rates
-        for strategy in stats['strategy_performance']:
-            data = stats['strategy_performance'][strategy]
-            if data['games'] > 0:
-                data['win_rate'] = data['wins'] / data['games'] * 100
-        
-        # Calculate average game length
-        stats['game_characteristics']['average_length'] = total_length / len(self.data_collector.games_data)
-        
-        # Convert defaultdicts to regular dicts for JSON serialization
-        stats['strategy_performance'] = dict(stats['strategy_performance'])
-        stats['matchup_matrix'] = dict(stats['matchup_matrix'])
-        stats['game_characteristics']['length_distribution'] = dict(stats['game_characteristics']['length_distribution'])
-        stats['game_characteristics']['opening_moves'] = dict(stats['game_characteristics']['opening_moves'])
-        stats['game_characteristics']['winning_patterns'] = dict(stats['game_characteristics']['winning_patterns'])
+        for code in _first_seen(x_strat.astype(np.int64) * NUM_STRATEGIES + o_strat):
+            i, j = divmod(code, NUM_STRATEGIES)
+            x_wins, o_wins, ties = matchup[i, j].tolist()
+            stats['matchup_matrix'][f"{STRATEGIES[i].value}_vs_{STRATEGIES[j].value}"] = {
+                'X_wins': x_wins, 'O_wins': o_wins, 'ties': ties, 'total': x_wins + o_wins + ties
+            }
         
         return stats
 
+def _first_seen(values: np.ndarray) -> list:
+    """Distinct values in order of first occurrence"""
+    keys, first_index = np.unique(values, return_index=True)
+    return keys[np.argsort(first_index)].tolist()
+
+def _count_values(values: np.ndarray) -> dict:
+    """Count occurrences of each integer value as a JSON-friendly dict, keys in first-seen order"""
+    keys, first_index, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first_index)
+    return dict(zip(keys[order].tolist(), counts[order].tolist()))
+
 def create_comprehensive_strategy_combinations():
     """Create comprehensive list of strategy combinations for large-scale generation"""
     all_strategies = list(Strategy)
@@ -365,5 +551,6 @@ def run_massive_generation():
     return stats
 
 if __name__ == "__main__":
+    configure_progress_logging()
     # Run massive generation
     stats = run_massive_generation()
\ No newline at end of file
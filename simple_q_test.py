@@ -5,9 +5,16 @@ Simple Q-Learning Agent Test
 Watch the Q-learning agent play step by step
 """
 
-from tictactoe_ai import TicTacToeAI, Strategy
+from tictactoe_ai import TicTacToeAI, Strategy, encode_board, decode_board
+import os
 import time
 
+# Set TICTACTOE_INTERACTIVE=0 for automated runs: no pauses or "Press Enter" prompts
+INTERACTIVE = os.environ.get('TICTACTOE_INTERACTIVE', '1') == '1'
+_SLEEP = time.sleep if INTERACTIVE else (lambda _: None)
+QUICK_TEST_GAMES = 20
+QUICK_TEST_PERCENT_PER_GAME = 100.0 / QUICK_TEST_GAMES
+
 def simple_q_learning_demo():
     print("🧠 SIMPLE Q-LEARNING DEMONSTRATION")
     print("=" * 45)
@@ -40,18 +47,19 @@ def simple_q_learning_demo():
         play_detailed_game(ai, opponent_name)
         
         # Quick performance test
-        print(f"\n📊 Quick Performance Test (20 games):")
-        results = ai.run_self_play_tournament(20, training=False)
+        print(f"\n📊 Quick Performance Test ({QUICK_TEST_GAMES} games):")
+        results = ai.run_self_play_tournament(QUICK_TEST_GAMES, training=False)
         
         q_wins = results['X']
         opponent_wins = results['O'] 
         ties = results['Tie']
         
-        print(f"   Q-Learning: {q_wins:2d} wins ({q_wins/20*100:5.1f}%)")
-        print(f"   {opponent_name}: {opponent_wins:2d} wins ({opponent_wins/20*100:5.1f}%)")
-        print(f"   Ties: {ties:2d} ({ties/20*100:5.1f}%)")
+        print(f"   Q-Learning: {q_wins:2d} wins ({q_wins * QUICK_TEST_PERCENT_PER_GAME:5.1f}%)\n"
+              f"   {opponent_name}: {opponent_wins:2d} wins ({opponent_wins * QUICK_TEST_PERCENT_PER_GAME:5.1f}%)\n"
+              f"   Ties: {ties:2d} ({ties * QUICK_TEST_PERCENT_PER_GAME:5.1f}%)")
         
-        input("\nPress Enter to continue to next opponent...")
+        if INTERACTIVE:
+            input("\nPress Enter to continue to next opponent...")
 
 def play_detailed_game(ai, opponent_name):
     print(f"\n🎯 Detailed Game: Q-Learning (X) vs {opponent_name} (O)")
@@ -72,30 +80,26 @@ def play_detailed_game(ai, opponent_name):
             print("🧠 Q-Learning Agent analyzing position...")
             
             # Show Q-values for available moves
-            state = ''.join(ai.board)
-            available_moves = ai.get_available_moves()
+            state, available_moves = ai.get_cached_state()
             
             if len(available_moves) <= 5:  # Only show if not too many
                 print("📊 Q-values for available moves:")
-                q_values = []
-                for move in available_moves:
-                    q_value = ai.q_agent_x.get_q_value(state, move)
-                    q_values.append((move, q_value))
+                q_values = ai.q_agent_x.get_q_values(state)[available_moves]
+                for move, q_value in zip(available_moves, q_values):
                     print(f"   Position {move}: {q_value:7.3f}")
                 
-                if q_values:
-                    best_move = max(q_values, key=lambda x: x[1])
-                    print(f"🎯 Highest Q-value: Position {best_move[0]} ({best_move[1]:.3f})")
+                best = int(q_values.argmax())
+                print(f"🎯 Highest Q-value: Position {available_moves[best]} ({q_values[best]:.3f})")
             
             # Make the move
-            time.sleep(0.5)
+            _SLEEP(0.5)
             move = ai.get_move_by_strategy('X', Strategy.Q_LEARNING)
             ai.make_move(move, 'X')
             print(f"✅ Q-Learning chooses position {move}")
             
         else:  # Opponent turn
             print(f"🎲 {opponent_name} thinking...")
-            time.sleep(0.3)
+            _SLEEP(0.3)
             move = ai.get_move_by_strategy('O', ai.strategy_o)
             ai.make_move(move, 'O')
             print(f"✅ {opponent_name} chooses position {move}")
@@ -133,25 +137,20 @@ def show_q_learning_insights():
     print(f"📊 Q-table statistics:")
     print(f"   Total states learned: {len(q_agent.q_table)}")
     
-    # Find interesting Q-values
-    all_q_values = []
-    for state, actions in q_agent.q_table.items():
-        for action, q_value in actions.items():
-            all_q_values.append((q_value, state, action))
-    
-    all_q_values.sort(reverse=True)
+    # Find interesting Q-values; untouched (zero) entries are skipped
+    top, bottom = q_agent.extreme_q_values(3)
     
     print(f"\n🏆 Top 3 learned strategies (highest Q-values):")
-    for i, (q_value, state, action) in enumerate(all_q_values[:3]):
-        print(f"{i+1}. Board: '{state}' → Move {action}: {q_value:.3f}")
+    for i, (q_value, state, action) in enumerate(top):
+        print(f"{i+1}. Board: '{decode_board(state)}' → Move {action}: {q_value:.3f}")
     
     print(f"\n📉 Bottom 3 learned strategies (lowest Q-values):")
-    for i, (q_value, state, action) in enumerate(all_q_values[-3:]):
-        print(f"{i+1}. Board: '{state}' → Move {action}: {q_value:.3f}")
+    for i, (q_value, state, action) in enumerate(bottom):
+        print(f"{i+1}. Board: '{decode_board(state)}' → Move {action}: {q_value:.3f}")
     
     # Test some common opening positions
     print(f"\n🎯 Q-values for common opening moves:")
-    empty_board = "         "
+    empty_board = encode_board("         ")
     for pos in [0, 2, 4, 6, 8]:  # corners and center
         q_val = q_agent.get_q_value(empty_board, pos)
         pos_name = {0: "top-left", 2: "top-right", 4: "center", 
@@ -5,25 +5,112 @@ Q-Learning Agent Testing Script
 Train and test the Q-learning agent to see how it plays
 """
 
-from tictactoe_ai import TicTacToeAI, Strategy
+from tictactoe_ai import (TicTacToeAI, Strategy, encode_board, decode_board, available_moves_from_key,
+                          Q_CACHE_DIR, Q_TABLE_FORMAT)
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import pickle
+import sys
+import tempfile
 import time
+from typing import Optional
 
-def test_q_learning_agent():
+USE_Q_CACHE = '--no-cache' not in sys.argv  # pass --no-cache to always retrain
+EVAL_GAMES = 50
+EVAL_PERCENT_PER_GAME = 100.0 / EVAL_GAMES
+STAGE_RANDOM_GAMES = 30  # Evaluation games per learning_stage
+STAGE_RANDOM_PERCENT_PER_GAME = 100.0 / STAGE_RANDOM_GAMES
+STAGE_MINIMAX_GAMES = 10
+STAGE_MINIMAX_PERCENT_PER_GAME = 100.0 / STAGE_MINIMAX_GAMES
+
+def q_cache_settings(ai: TicTacToeAI, episodes: int, opponent_strategy: Strategy, seed: int) -> tuple:
+    """Everything that shapes a trained Q-table; stored with the table and checked on load"""
+    agent = ai.q_agent_x
+    return (Q_TABLE_FORMAT, episodes, opponent_strategy.name, seed, agent.learning_rate,
+            agent.discount_factor, agent.epsilon, agent.use_symmetry, agent.max_states)
+
+def q_cache_path(settings: tuple) -> str:
+    return os.path.join(Q_CACHE_DIR, "q_" + "_".join(map(str, settings)) + ".pkl")
+
+def load_cached_agent(episodes: int, opponent_strategy: Strategy = Strategy.RANDOM,
+                      seed: int = 0) -> Optional[TicTacToeAI]:
+    """Q-learning (X) vs opponent AI with its Q-table loaded from disk, or None when not cached"""
+    ai = TicTacToeAI(Strategy.Q_LEARNING, opponent_strategy, seed=seed)
+    settings = q_cache_settings(ai, episodes, opponent_strategy, seed)
+    path = q_cache_path(settings)
+    if not USE_Q_CACHE or not os.path.exists(path):
+        return None
+    
+    with open(path, 'rb') as f:
+        cached_settings, q_table = pickle.load(f)
+    if cached_settings != settings:
+        print(f"Ignoring cached Q-table {path}: it was trained with different settings")
+        return None
+    ai.q_agent_x.q_table = q_table
+    ai._rng.seed(seed)  # Same RNG state as train_agent leaves for evaluation
+    print(f"Loaded cached Q-table ({episodes} episodes against {opponent_strategy.value}) from {path}")
+    return ai
+
+def train_agent(episodes: int, opponent_strategy: Strategy = Strategy.RANDOM, seed: int = 0) -> TicTacToeAI:
+    """Train a Q-learning (X) vs opponent AI and cache its Q-table on disk"""
+    ai = TicTacToeAI(Strategy.Q_LEARNING, opponent_strategy, seed=seed)
+    ai.train_q_learning_agent(episodes=episodes, opponent_strategy=opponent_strategy)
+    # Evaluate from the seed, not from wherever training left the RNG, so a cached table scores the same
+    ai._rng.seed(seed)
+    if USE_Q_CACHE:
+        settings = q_cache_settings(ai, episodes, opponent_strategy, seed)
+        path = q_cache_path(settings)
+        os.makedirs(Q_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((settings, ai.q_agent_x.q_table), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    return ai
+
+def get_trained_agent(episodes: int, opponent_strategy: Strategy = Strategy.RANDOM, seed: int = 0) -> TicTacToeAI:
+    """Q-learning (X) vs opponent AI whose trained Q-table is reused from disk when cached"""
+    return (load_cached_agent(episodes, opponent_strategy, seed) or
+            train_agent(episodes, opponent_strategy, seed))
+
+def test_cached_agent_matches_fresh(episodes: int = 100, num_games: int = 30):
+    """A Q-table loaded from the cache must evaluate exactly like the freshly trained one"""
+    global Q_CACHE_DIR, USE_Q_CACHE
+    saved = Q_CACHE_DIR, USE_Q_CACHE
+    with tempfile.TemporaryDirectory() as cache_dir:
+        Q_CACHE_DIR, USE_Q_CACHE = cache_dir, True
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fresh = train_agent(episodes, Strategy.RANDOM)
+                cached = load_cached_agent(episodes, Strategy.RANDOM)
+        finally:
+            Q_CACHE_DIR, USE_Q_CACHE = saved
+    
+    assert cached is not None, "trained Q-table was not cached"
+    for opponent in (Strategy.RANDOM, Strategy.MINIMAX):
+        fresh.strategy_o = cached.strategy_o = opponent
+        fresh_results = fresh.run_batch_tournament(num_games)
+        cached_results = cached.run_batch_tournament(num_games)
+        assert fresh_results == cached_results, f"vs {opponent.value}: {fresh_results} != {cached_results}"
+    print("✅ Cached and freshly trained agents evaluate identically")
+
+def test_q_learning_agent(ai: TicTacToeAI = None) -> TicTacToeAI:
     print("🧠 Q-LEARNING AGENT TESTING")
     print("=" * 50)
     
-    # Create AI instance
-    ai = TicTacToeAI()
-    
     print("\n1. 🎯 Training Q-Learning Agent")
     print("-" * 30)
-    print("Training against random opponent for 1000 episodes...")
-    
-    start_time = time.time()
-    ai.train_q_learning_agent(episodes=1000, opponent_strategy=Strategy.RANDOM)
-    training_time = time.time() - start_time
-    
-    print(f"Training completed in {training_time:.1f} seconds")
+    if ai is not None:
+        print("Using the agent that was passed in (already trained)")
+    else:
+        ai = load_cached_agent(1000, Strategy.RANDOM)
+    if ai is None:
+        print("Training against random opponent for 1000 episodes...")
+        start_time = time.perf_counter()
+        ai = train_agent(1000, Strategy.RANDOM)
+        print(f"Training completed in {time.perf_counter() - start_time:.1f} seconds")
     
     # Test against different opponents
     print("\n2. 🎮 Testing Trained Q-Learning Agent")
@@ -36,40 +123,57 @@ def test_q_learning_agent():
         (Strategy.MINIMAX, "Minimax (Expert)")
     ]
     
-    ai.strategy_x = Strategy.Q_LEARNING
+    # Each opponent is evaluated in its own process against a copy of the trained table;
+    # output is captured per process and printed in the original order
+    with ProcessPoolExecutor(max_workers=len(test_opponents), mp_context=mp.get_context('spawn')) as executor:
+        outputs = executor.map(run_captured, [eval_vs] * len(test_opponents),
+                               *zip(*test_opponents), [ai.q_agent_x.q_table] * len(test_opponents))
+        for output in outputs:
+            print(output, end='')
     
-    for opponent_strategy, opponent_name in test_opponents:
-        print(f"\n🆚 Q-Learning vs {opponent_name}")
-        ai.strategy_o = opponent_strategy
-        
-        results = ai.run_self_play_tournament(50, training=False)
-        
-        q_win_rate = results['X'] / 50 * 100
-        opponent_win_rate = results['O'] / 50 * 100
-        tie_rate = results['Tie'] / 50 * 100
-        
-        print(f"   Q-Learning: {q_win_rate:5.1f}% wins")
-        print(f"   {opponent_name}: {opponent_win_rate:5.1f}% wins") 
-        print(f"   Ties: {tie_rate:5.1f}%")
-        
-        # Performance assessment
-        if q_win_rate > 70:
-            print("   📈 Excellent performance!")
-        elif q_win_rate > 50:
-            print("   👍 Good performance!")
-        elif q_win_rate > 30:
-            print("   📊 Decent performance")
-        else:
-            print("   📉 Needs more training")
-
-def demonstrate_q_learning_gameplay():
+    return ai
+
+def run_captured(fn, *args) -> str:
+    """Run fn in a worker process and return everything it printed"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        fn(*args)
+    return buffer.getvalue()
+
+def eval_vs(opponent_strategy, opponent_name, q_table):
+    """Play the trained Q-learning agent against one opponent"""
+    print(f"\n🆚 Q-Learning vs {opponent_name}")
+    ai = TicTacToeAI(Strategy.Q_LEARNING, opponent_strategy, seed=0)
+    ai.q_agent_x.q_table = q_table
+    
+    results = ai.run_batch_tournament(EVAL_GAMES)
+    
+    q_win_rate = results['X'] * EVAL_PERCENT_PER_GAME
+    opponent_win_rate = results['O'] * EVAL_PERCENT_PER_GAME
+    tie_rate = results['Tie'] * EVAL_PERCENT_PER_GAME
+    
+    print(f"   Q-Learning: {q_win_rate:5.1f}% wins\n"
+          f"   {opponent_name}: {opponent_win_rate:5.1f}% wins\n"
+          f"   Ties: {tie_rate:5.1f}%")
+    
+    # Performance assessment
+    if q_win_rate > 70:
+        print("   📈 Excellent performance!")
+    elif q_win_rate > 50:
+        print("   👍 Good performance!")
+    elif q_win_rate > 30:
+        print("   📊 Decent performance")
+    else:
+        print("   📉 Needs more training")
+
+def demonstrate_q_learning_gameplay(ai: TicTacToeAI = None):
     print("\n3. 🎲 Q-Learning Gameplay Demonstration")
     print("-" * 45)
     
-    # Train a fresh agent
-    ai = TicTacToeAI(Strategy.Q_LEARNING, Strategy.RANDOM)
-    print("Training Q-learning agent for demonstration...")
-    ai.train_q_learning_agent(episodes=500, opponent_strategy=Strategy.RANDOM)
+    # Train a fresh agent unless a trained one is shared in
+    if ai is None:
+        print("Training Q-learning agent for demonstration...")
+        ai = get_trained_agent(500, Strategy.RANDOM)
     
     print("\n🎮 Sample Game: Q-Learning (X) vs Random (O)")
     print("=" * 50)
@@ -83,23 +187,25 @@ def demonstrate_q_learning_gameplay():
     # Show some Q-values for common positions
     q_agent = ai.q_agent_x
     
-    # Test some common board states
+    # Test some common board states (encoded once; moves are read off the packed key)
     test_states = [
-        ("         ", "Empty board"),
-        ("X        ", "After first move"),
-        ("X   O    ", "Early game"),
-        ("X O X    ", "Mid game")
+        (encode_board(board), description) for board, description in [
+            ("         ", "Empty board"),
+            ("X        ", "After first move"),
+            ("X   O    ", "Early game"),
+            ("X O X    ", "Mid game")
+        ]
     ]
     
     print("Q-values for different board states:")
     for state, description in test_states:
-        print(f"\n{description}: {state}")
-        available_moves = [i for i in range(9) if state[i] == ' ']
+        print(f"\n{description}: {decode_board(state)}")
+        available_moves = available_moves_from_key(state)
         
         if len(available_moves) <= 5:  # Only show if not too many moves
+            q_values = q_agent.get_q_values(state)
             for move in available_moves:
-                q_value = q_agent.get_q_value(state, move)
-                print(f"  Position {move}: {q_value:6.3f}")
+                print(f"  Position {move}: {q_values[move]:6.3f}")
 
 def compare_learning_progress():
     print("\n4. 📈 Learning Progress Comparison")
@@ -108,64 +214,64 @@ def compare_learning_progress():
     # Test learning at different stages
     training_stages = [100, 300, 500, 1000]
     
-    for episodes in training_stages:
-        print(f"\n🎯 After {episodes} training episodes:")
-        
-        # Create fresh agent
-        ai = TicTacToeAI(Strategy.Q_LEARNING, Strategy.RANDOM)
-        ai.train_q_learning_agent(episodes=episodes, opponent_strategy=Strategy.RANDOM)
-        
-        # Test against random opponent
-        ai.strategy_o = Strategy.RANDOM
-        results = ai.run_self_play_tournament(30, training=False)
-        
-        win_rate = results['X'] / 30 * 100
-        print(f"   Win rate vs Random: {win_rate:5.1f}%")
-        
-        # Test one game against minimax
-        ai.strategy_o = Strategy.MINIMAX
-        minimax_results = ai.run_self_play_tournament(10, training=False)
-        minimax_performance = minimax_results['X'] / 10 * 100
-        print(f"   Win rate vs Minimax: {minimax_performance:5.1f}%")
+    # Stages share no state, so each one trains and evaluates in its own process
+    with ProcessPoolExecutor(max_workers=len(training_stages), mp_context=mp.get_context('spawn')) as executor:
+        for output in executor.map(run_captured, [learning_stage] * len(training_stages), training_stages):
+            print(output, end='')
+
+def learning_stage(episodes: int):
+    """Train a fresh agent for the given episodes and test it"""
+    print(f"\n🎯 After {episodes} training episodes:")
+    
+    # Create fresh agent
+    ai = get_trained_agent(episodes, Strategy.RANDOM)
+    
+    # Test against random opponent
+    ai.strategy_o = Strategy.RANDOM
+    results = ai.run_batch_tournament(STAGE_RANDOM_GAMES)
+    
+    win_rate = results['X'] * STAGE_RANDOM_PERCENT_PER_GAME
+    print(f"   Win rate vs Random: {win_rate:5.1f}%")
+    
+    # Test a few games against minimax
+    ai.strategy_o = Strategy.MINIMAX
+    minimax_results = ai.run_batch_tournament(STAGE_MINIMAX_GAMES)
+    minimax_performance = minimax_results['X'] * STAGE_MINIMAX_PERCENT_PER_GAME
+    print(f"   Win rate vs Minimax: {minimax_performance:5.1f}%")
 
-def analyze_q_table():
+def analyze_q_table(ai: TicTacToeAI = None):
     print("\n5. 🔍 Q-Table Analysis")
     print("-" * 25)
     
-    # Train agent
-    ai = TicTacToeAI(Strategy.Q_LEARNING, Strategy.RANDOM)
-    ai.train_q_learning_agent(episodes=1000, opponent_strategy=Strategy.RANDOM)
+    # Train agent unless a trained one is shared in
+    ai = ai or get_trained_agent(1000, Strategy.RANDOM)
     
     q_agent = ai.q_agent_x
     
     print(f"Q-table size: {len(q_agent.q_table)} states")
     
-    # Find states with highest Q-values
-    all_q_values = []
-    for state, actions in q_agent.q_table.items():
-        for action, q_value in actions.items():
-            all_q_values.append((q_value, state, action))
-    
-    all_q_values.sort(reverse=True)
+    # Find states with highest Q-values; only legal entries that learned something are ranked
+    top, bottom = q_agent.extreme_q_values(5)
     
     print("\n🏆 Top 5 Q-values (best learned moves):")
-    for i, (q_value, state, action) in enumerate(all_q_values[:5]):
-        print(f"{i+1}. State: {state} → Move {action}: {q_value:.3f}")
+    for i, (q_value, state, action) in enumerate(top):
+        print(f"{i+1}. State: {decode_board(state)} → Move {action}: {q_value:.3f}")
     
     print("\n📉 Bottom 5 Q-values (worst learned moves):")
-    for i, (q_value, state, action) in enumerate(all_q_values[-5:]):
-        print(f"{i+1}. State: {state} → Move {action}: {q_value:.3f}")
+    for i, (q_value, state, action) in enumerate(bottom):
+        print(f"{i+1}. State: {decode_board(state)} → Move {action}: {q_value:.3f}")
 
 if __name__ == "__main__":
     print("🧠 Q-LEARNING AGENT COMPREHENSIVE TEST")
     print("=" * 60)
     
     try:
-        # Run all tests
-        test_q_learning_agent()
-        demonstrate_q_learning_gameplay()
+        # Run all tests; one trained agent is shared, only the progress comparison trains its own
+        test_cached_agent_matches_fresh()
+        ai = test_q_learning_agent()
+        demonstrate_q_learning_gameplay(ai)
         compare_learning_progress()
-        analyze_q_table()
+        analyze_q_table(ai)
         
         print("\n" + "=" * 60)
         print("✅ Q-Learning Agent Testing Complete!")
@@ -3,23 +3,107 @@ import math
 import json
 import numpy as np
 import csv
+import os
+import shutil
+import sys
 import time
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict
-from collections import defaultdict
+from typing import List, Tuple, Optional, Dict, NamedTuple
+from collections import Counter, defaultdict, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import attrgetter
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib encoder is used without it
+    orjson = None
+
+CSV_BUFFER_SIZE = 1 << 20  # Large write buffer for CSV and JSONL exports
+
+def write_json(filename: str, data):
+    """Write data as 2-space-indented JSON, through orjson when it is installed"""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS |
+                                 orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def read_json(filename: str):
+    """Read a JSON file, through orjson when it is installed"""
+    if orjson is not None:
+        with open(filename, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+def jsonl_line(row) -> bytes:
+    """One newline-terminated line of compact JSON, through orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS |
+                            orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(row).encode() + b'\n'
+
+def write_jsonl(filename: str, rows):
+    """Stream rows to a file as newline-delimited compact JSON, one row at a time"""
+    with open(filename, 'wb', buffering=CSV_BUFFER_SIZE) as f:
+        f.writelines(map(jsonl_line, rows))
+
+def read_jsonl(filename: str):
+    """Yield the rows of a newline-delimited JSON file without loading it all"""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(filename, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
 
 @dataclass
 class GameRecord:
     """Record of a single game for training data"""
+    # No per-record __dict__; spelled out because dataclass(slots=True) needs Python 3.10
+    __slots__ = ('game_id', 'player_x_strategy', 'player_o_strategy', 'moves', 'winner', 'game_length', 'timestamp')
+    
     game_id: int
     player_x_strategy: str
     player_o_strategy: str
-    moves: List[Tuple[str, int, str]]  # (board_state, move, player)
+    moves: List[Tuple[int, str]]  # (move, player); board states via moves_with_states()
     winner: str
     game_length: int
-    timestamp: str
+    timestamp: int  # time.time_ns() at game start; ISO 8601 text via timestamp_iso()
+    
+    def timestamp_iso(self) -> str:
+        """Game start time as a local ISO 8601 string, formatted only when exported"""
+        return format_timestamp(self.timestamp)
+    
+    def moves_with_states(self) -> List[Tuple[str, int, str]]:
+        """Rebuild (board_state, move, player) with the board as it was before each move"""
+        return replay_moves(self.moves)
+    
+    def moves_sequence(self) -> str:
+        """CSV form of the moves: 'board_state,move,player' entries joined by ';'"""
+        return _format_moves_sequence(tuple(self.moves))
+    
+    def moves_as_dicts(self) -> List[Dict]:
+        """JSON form of the moves, built fresh on each call from the memoized replay"""
+        return [{'board_state': state, 'move': move, 'player': player}
+                for state, move, player in _replay_moves_cached(tuple(self.moves))]
+    
+    def to_dict(self) -> Dict:
+        """JSON export form of the game"""
+        return {
+            'game_id': self.game_id,
+            'player_x_strategy': self.player_x_strategy,
+            'player_o_strategy': self.player_o_strategy,
+            'moves': self.moves_as_dicts(),
+            'winner': self.winner,
+            'game_length': self.game_length,
+            'timestamp': self.timestamp_iso()
+        }
     
 @dataclass
 class TrainingDataset:
@@ -29,115 +113,300 @@ class TrainingDataset:
     strategy_matchups: Dict[str, int]
     win_rates: Dict[str, Dict[str, float]]
 
+def format_timestamp(timestamp_ns) -> str:
+    """ISO 8601 form of a time.time_ns() value, matching datetime.now().isoformat() (text passes through)"""
+    if isinstance(timestamp_ns, str):
+        return timestamp_ns
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanoseconds // 1000).isoformat()
+
+# The 18 possible (move, player) entries, shared by every game record instead of allocated per move
+MOVE_TUPLES = {player: tuple((move, player) for move in range(9)) for player in ('X', 'O')}
+
+def pack_moves(moves: List[Tuple[int, str]]) -> int:
+    """Pack a game's moves into one int: 5 bits per move (4-bit position, 1-bit player)"""
+    packed = 0
+    for i, (move, player) in enumerate(moves):
+        packed |= ((move << 1) | (player == 'O')) << (5 * i)
+    return packed
+
+def unpack_moves(packed: int, game_length: int) -> List[Tuple[int, str]]:
+    """Recover the (move, player) sequence from pack_moves output"""
+    moves = []
+    for i in range(game_length):
+        bits = (packed >> (5 * i)) & 0x1F
+        moves.append(MOVE_TUPLES['O' if bits & 1 else 'X'][bits >> 1])
+    return moves
+
+def replay_moves(moves) -> List[Tuple[str, int, str]]:
+    """Pair each (move, player) with the board string as it was before the move"""
+    board = [' '] * 9
+    states = []
+    for move, player in moves:
+        states.append((''.join(board), move, player))
+        board[move] = player
+    return states
+
+# Games repeat often (deterministic strategies always do), so export formatting is memoized per move sequence
+@lru_cache(maxsize=1 << 16)
+def _format_moves_sequence(moves: Tuple[Tuple[int, str], ...]) -> str:
+    return ';'.join([f"{state},{move},{player}"
+                     for state, move, player in replay_moves(moves)])
+
+# Immutable, so games with the same moves can share it
+@lru_cache(maxsize=1 << 16)
+def _replay_moves_cached(moves: Tuple[Tuple[int, str], ...]) -> Tuple[Tuple[str, int, str], ...]:
+    return tuple(replay_moves(moves))
+
+class GameRecordPool:
+    """Free list of GameRecord shells reused across games to cut allocation churn
+    
+    Only worth attaching for code that releases every record once it is written out; records
+    that are kept (as generate_training_data keeps them) are never recycled.
+    """
+    
+    def __init__(self, size: int = 0):
+        self._free = [self._new_record() for _ in range(size)]
+    
+    @staticmethod
+    def _new_record() -> GameRecord:
+        return GameRecord(game_id=0, player_x_strategy='', player_o_strategy='', moves=[],
+                          winner='', game_length=0, timestamp=0)
+    
+    def rent(self, moves: List[Tuple[int, str]], **fields) -> GameRecord:
+        """Take a shell from the pool and fill it (same arguments as GameRecord)"""
+        record = self._free.pop() if self._free else self._new_record()
+        record.moves.extend(moves)
+        for name, value in fields.items():
+            setattr(record, name, value)
+        return record
+    
+    def release(self, records: List[GameRecord]):
+        """Return records to the pool; they must not be used afterwards"""
+        for record in records:
+            record.moves.clear()
+            self._free.append(record)
+
+# Outcome codes used by the columnar statistics
+WINNER_ID = {'X': 0, 'O': 1, 'Tie': 2}
+CSV_FIELDNAMES = ['game_id', 'player_x_strategy', 'player_o_strategy',
+                  'winner', 'game_length', 'timestamp', 'moves_sequence']
+
+def wilson_interval_width(successes: np.ndarray, trials: int, z: float = 1.96) -> np.ndarray:
+    """Width of the Wilson score interval for each success count (95% by default)"""
+    p = successes / trials
+    z2_n = z * z / trials
+    return 2 * z * np.sqrt(p * (1 - p) / trials + z2_n / (4 * trials)) / (1 + z2_n)
+
+def game_csv_row(game: GameRecord) -> tuple:
+    """A game's export_to_csv row, in CSV_FIELDNAMES order"""
+    return (game.game_id, game.player_x_strategy, game.player_o_strategy, game.winner,
+            game.game_length, game.timestamp_iso(), game.moves_sequence())
+
+class GameColumns(NamedTuple):
+    """Per-game summary columns of a collector's games (first_moves holds None for an empty game)"""
+    x_strategies: List[str]
+    o_strategies: List[str]
+    winners: List[str]
+    game_lengths: List[int]
+    first_moves: List[Optional[int]]
+
 class GameplayDataCollector:
     """Collects and manages training data from AI vs AI games"""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.games_data = []
         self.current_game_id = 0
+        self.last_record: Optional[GameRecord] = None
+        # While streaming, games go straight to files and only their summary columns are kept
+        self._streams = []
+        self._open_files = []
+        self._streamed_columns = GameColumns([], [], [], [], [])
+        
+    def record_game(self, game_record: GameRecord) -> None:
+        """Add a game record to the dataset (or write it out, while streaming)"""
+        self.last_record = game_record
+        if not self._streams:
+            self.games_data.append(game_record)
+            return
+        
+        for write in self._streams:
+            write(game_record)
+        for column, value in zip(self._streamed_columns, self._summary(game_record)):
+            column.append(value)
+    
+    @staticmethod
+    def _summary(game: GameRecord) -> tuple:
+        return (game.player_x_strategy, game.player_o_strategy, game.winner, game.game_length,
+                game.moves[0][0] if game.moves else None)
+    
+    def stream_to(self, csv_filename: Optional[str] = None, jsonl_filename: Optional[str] = None) -> None:
+        """Write each recorded game to the given files instead of keeping it, until close_streams()
+        
+        Files have the export_to_csv / export_to_jsonl layout; JSONL game lines go to a .part file
+        until close_streams() writes the metadata line and then copies them after it. Statistics
+        and pattern analysis still cover streamed games; exporting the kept records does not.
+        """
+        if csv_filename:
+            csvfile = open(csv_filename, 'w', newline='', buffering=CSV_BUFFER_SIZE)
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_FIELDNAMES)
+            self._open_files.append((csv_filename, csvfile, None))
+            self._streams.append(lambda game: writer.writerow(game_csv_row(game)))
+        if jsonl_filename:
+            jsonlfile = open(f"{jsonl_filename}.part", 'wb', buffering=CSV_BUFFER_SIZE)
+            self._open_files.append((jsonl_filename, jsonlfile, self._jsonl_metadata))
+            self._streams.append(lambda game: jsonlfile.write(jsonl_line(game.to_dict())))
+    
+    def close_streams(self) -> None:
+        """Finish and close the files opened by stream_to"""
+        for filename, f, header in self._open_files:
+            f.close()
+            if header is not None:
+                # The metadata line goes first, so the streamed lines are copied in after it
+                with open(filename, 'wb', buffering=CSV_BUFFER_SIZE) as out, open(f.name, 'rb') as part:
+                    out.write(jsonl_line(header()))
+                    shutil.copyfileobj(part, out, CSV_BUFFER_SIZE)
+                os.remove(f.name)
+            self._report_export(filename)
+        self._open_files = []
+        self._streams = []
+    
+    def total_games(self) -> int:
+        """Number of recorded games, streamed ones included"""
+        return len(self.games_data) + len(self._streamed_columns[0])
+    
+    def game_columns(self) -> GameColumns:
+        """Summary columns (see _summary) of every recorded game, streamed ones first, as new lists"""
+        games = self.games_data
+        first_moves = [game.moves[0][0] if game.moves else None for game in games]
+        kept = (list(map(attrgetter('player_x_strategy'), games)), list(map(attrgetter('player_o_strategy'), games)),
+                list(map(attrgetter('winner'), games)), list(map(attrgetter('game_length'), games)), first_moves)
+        return GameColumns(*(streamed + column for streamed, column in zip(self._streamed_columns, kept)))
+    
+    def strategies_used(self) -> List[str]:
+        """Distinct strategy names across all games, from one pass that keeps only distinct (X, O) pairs"""
+        matchups = set(map(attrgetter('player_x_strategy', 'player_o_strategy'), self.games_data))
+        names = set(chain.from_iterable(matchups))
+        names.update(self._streamed_columns.x_strategies)
+        names.update(self._streamed_columns.o_strategies)
+        return list(names)
+    
+    def _jsonl_metadata(self) -> Dict:
+        return {'metadata': {
+            'total_games': self.total_games(),
+            'export_timestamp': datetime.now().isoformat(),
+            'strategies_used': self.strategies_used()
+        }}
+    
+    @staticmethod
+    def _report_export(filename: str) -> None:
+        """Announce a finished export in one write, so concurrent exports never interleave their lines"""
+        sys.stdout.write(f"Training data exported to {filename}\n")
         
-    def record_game(self, game_record: GameRecord):
-        """Add a game record to the dataset"""
-        self.games_data.append(game_record)
-        
-    def export_to_csv(self, filename: str = "training_data.csv"):
+    def export_to_csv(self, filename: str = "training_data.csv") -> None:
         """Export training data to CSV format"""
-        with open(filename, 'w', newline='') as csvfile:
-            fieldnames = ['game_id', 'player_x_strategy', 'player_o_strategy', 
-                         'winner', 'game_length', 'timestamp', 'moves_sequence']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        with open(filename, 'w', newline='', buffering=CSV_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
             
-            writer.writeheader()
-            for game in self.games_data:
-                moves_str = ';'.join([f"{state},{move},{player}" for state, move, player in game.moves])
-                writer.writerow({
-                    'game_id': game.game_id,
-                    'player_x_strategy': game.player_x_strategy,
-                    'player_o_strategy': game.player_o_strategy,
-                    'winner': game.winner,
-                    'game_length': game.game_length,
-                    'timestamp': game.timestamp,
-                    'moves_sequence': moves_str
-                })
-        print(f"Training data exported to {filename}")
-        
-    def export_to_json(self, filename: str = "training_data.json"):
+            writer.writerow(CSV_FIELDNAMES)
+            writer.writerows(map(game_csv_row, self.games_data))
+        self._report_export(filename)
+        
+    def export_to_json(self, filename: str = "training_data.json") -> None:
         """Export training data to JSON format"""
         data = {
             'metadata': {
                 'total_games': len(self.games_data),
                 'export_timestamp': datetime.now().isoformat(),
-                'strategies_used': list(set([g.player_x_strategy for g in self.games_data] + 
-                                          [g.player_o_strategy for g in self.games_data]))
+                'strategies_used': self.strategies_used()
             },
-            'games': [
-                {
-                    'game_id': game.game_id,
-                    'player_x_strategy': game.player_x_strategy,
-                    'player_o_strategy': game.player_o_strategy,
-                    'moves': [{'board_state': state, 'move': move, 'player': player} 
-                             for state, move, player in game.moves],
-                    'winner': game.winner,
-                    'game_length': game.game_length,
-                    'timestamp': game.timestamp
-                } for game in self.games_data
-            ]
+            'games': [game.to_dict() for game in self.games_data]
         }
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
-        print(f"Training data exported to {filename}")
-        
+        write_json(filename, data)
+        self._report_export(filename)
+    
+    def export_to_jsonl(self, filename: str = "training_data.jsonl") -> None:
+        """Export training data as JSON lines: a metadata line, then one line per game (read back with read_jsonl)"""
+        write_jsonl(filename, chain((self._jsonl_metadata(),), map(GameRecord.to_dict, self.games_data)))
+        self._report_export(filename)
+        
+    @staticmethod
+    def _strategy_columns(columns: GameColumns) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Columnar view of the games: (names, x_ids, o_ids, winner ids), names interned to ids in first-seen order"""
+        x_names, o_names = columns.x_strategies, columns.o_strategies
+        num_games = len(x_names)
+        names = list(dict.fromkeys(chain.from_iterable(zip(x_names, o_names))))
+        strategy_ids = {name: i for i, name in enumerate(names)}
+        x_ids = np.fromiter(map(strategy_ids.__getitem__, x_names), dtype=np.intp, count=num_games)
+        o_ids = np.fromiter(map(strategy_ids.__getitem__, o_names), dtype=np.intp, count=num_games)
+        winners = np.fromiter(map(WINNER_ID.get, columns.winners, repeat(WINNER_ID['Tie'])),
+                              dtype=np.intp, count=num_games)
+        return names, x_ids, o_ids, winners
+    
+    @staticmethod
+    def _strategy_totals(x_ids: np.ndarray, o_ids: np.ndarray, winners: np.ndarray,
+                         num_strategies: int) -> Tuple[List[int], List[int]]:
+        """Games played and games won per strategy id"""
+        usage = np.bincount(x_ids, minlength=num_strategies) + np.bincount(o_ids, minlength=num_strategies)
+        wins = (np.bincount(x_ids[winners == WINNER_ID['X']], minlength=num_strategies) +
+                np.bincount(o_ids[winners == WINNER_ID['O']], minlength=num_strategies))
+        return usage.tolist(), wins.tolist()
+    
+    def strategy_win_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(games played, games won) per strategy name, in first-seen order"""
+        names, x_ids, o_ids, winners = self._strategy_columns(self.game_columns())
+        usage, wins = self._strategy_totals(x_ids, o_ids, winners, len(names))
+        return dict(zip(names, zip(usage, wins)))
+    
     def get_statistics(self) -> Dict:
         """Get comprehensive statistics about the collected data"""
-        if not self.games_data:
+        num_games = self.total_games()
+        if not num_games:
             return {"error": "No games recorded"}
-            
+        
+        columns = self.game_columns()
+        names, x_ids, o_ids, winners = self._strategy_columns(columns)
+        num_strategies = len(names)
+        lengths = np.fromiter(columns.game_lengths, dtype=np.int64, count=num_games)
+        
         stats = {
-            'total_games': len(self.games_data),
+            'total_games': num_games,
             'strategy_usage': defaultdict(int),
             'win_rates': defaultdict(lambda: {'wins': 0, 'total': 0}),
             'matchup_results': defaultdict(lambda: {'X_wins': 0, 'O_wins': 0, 'ties': 0}),
-            'average_game_length': 0,
+            'average_game_length': int(lengths.sum()) / num_games,
             'game_length_distribution': defaultdict(int)
         }
-        
-        total_length = 0
-        for game in self.games_data:
-            # Strategy usage
-            stats['strategy_usage'][game.player_x_strategy] += 1
-            stats['strategy_usage'][game.player_o_strategy] += 1
-            
-            # Win rates
-            if game.winner != 'Tie':
-                if game.winner == 'X':
-                    stats['win_rates'][game.player_x_strategy]['wins'] += 1
-                else:
-                    stats['win_rates'][game.player_o_strategy]['wins'] += 1
-            
-            stats['win_rates'][game.player_x_strategy]['total'] += 1
-            stats['win_rates'][game.player_o_strategy]['total'] += 1
-            
-            # Matchup results
-            matchup = f"{game.player_x_strategy}_vs_{game.player_o_strategy}"
-            if game.winner == 'X':
-                stats['matchup_results'][matchup]['X_wins'] += 1
-            elif game.winner == 'O':
-                stats['matchup_results'][matchup]['O_wins'] += 1
-            else:
-                stats['matchup_results'][matchup]['ties'] += 1
-                
-            # Game length
-            total_length += game.game_length
-            stats['game_length_distribution'][game.game_length] += 1
-            
-        stats['average_game_length'] = total_length / len(self.games_data)
-        
-        # Calculate win rate percentages
-        for strategy in stats['win_rates']:
-            if stats['win_rates'][strategy]['total'] > 0:
-                win_rate = stats['win_rates'][strategy]['wins'] / stats['win_rates'][strategy]['total']
-                stats['win_rates'][strategy]['percentage'] = win_rate * 100
+        strategy_usage = stats['strategy_usage']
+        win_rates = stats['win_rates']
+        matchup_results = stats['matchup_results']
+        length_distribution = stats['game_length_distribution']
+        
+        # Strategy usage and win rates
+        usage, wins = self._strategy_totals(x_ids, o_ids, winners, num_strategies)
+        for name, total, won in zip(names, usage, wins):
+            strategy_usage[name] = total
+            win_rates[name] = {'wins': won, 'total': total, 'percentage': won / total * 100}
+        
+        # Matchup results, keyed by the composite x_id * N + o_id
+        matchups, first_seen, inverse = np.unique(x_ids * num_strategies + o_ids,
+                                                  return_index=True, return_inverse=True)
+        outcomes = np.bincount(inverse * 3 + winners, minlength=len(matchups) * 3).reshape(-1, 3).tolist()
+        matchups = matchups.tolist()
+        for i in np.argsort(first_seen).tolist():
+            x_id, o_id = divmod(matchups[i], num_strategies)
+            x_wins, o_wins, ties = outcomes[i]
+            matchup_results[f"{names[x_id]}_vs_{names[o_id]}"] = {
+                'X_wins': x_wins, 'O_wins': o_wins, 'ties': ties
+            }
+        
+        # Game length distribution
+        game_lengths, first_seen, counts = np.unique(lengths, return_index=True, return_counts=True)
+        game_lengths, counts = game_lengths.tolist(), counts.tolist()
+        for i in np.argsort(first_seen).tolist():
+            length_distribution[game_lengths[i]] = counts[i]
                 
         return dict(stats)
 
@@ -149,266 +418,508 @@ class Strategy(Enum):
     DEFENSIVE = "defensive"
     HYBRID = "hybrid"
 
+# Dense integer ids for strategies, for array-indexed statistics
+STRATEGIES = list(Strategy)
+STRAT_ID = {s.value: i for i, s in enumerate(STRATEGIES)}
+NUM_STRATEGIES = len(STRATEGIES)
+
+def is_deterministic(strategy: Strategy, training: bool = False) -> bool:
+    """Whether a strategy always picks the same move in the same position (no RNG draws)"""
+    return strategy == Strategy.MINIMAX or (strategy == Strategy.Q_LEARNING and not training)
+
+# 2 bits per cell: empty/X/O
+CELL_CODES = {' ': 0, 'X': 1, 'O': 2}
+CELL_CHARS = (' ', 'X', 'O')
+
+# Shared Q-values for states the agent has never updated
+_ZERO_Q_VALUES = np.zeros(9, dtype=np.float32)
+_ZERO_Q_VALUES.flags.writeable = False
+_CELL_SHIFTS = np.arange(0, 18, 2, dtype=np.int64)
+
+def encode_board(board: List[str]) -> int:
+    """Pack a board into an 18-bit integer (2 bits per cell)"""
+    key = 0
+    for i, cell in enumerate(board):
+        key |= CELL_CODES[cell] << (2 * i)
+    return key
+
+def decode_board(key: int) -> str:
+    """Unpack an encoded board back into its 9-char string form"""
+    return ''.join(CELL_CHARS[(key >> (2 * i)) & 3] for i in range(9))
+
+def available_moves_from_key(key: int) -> List[int]:
+    """Get the empty cells of an encoded board"""
+    return list(MASK_CELLS[FULL_BOARD_MASK ^ _COMPACT_BITS[(key | key >> 1) & _CELL_LOW_BITS]])
+
+def _board_symmetries() -> Tuple[Tuple[int, ...], ...]:
+    """The 8 rotations/reflections of the board as cell permutations (new[i] = old[perm[i]])"""
+    rotate = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+    reflect = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+    perms = []
+    perm = tuple(range(9))
+    for _ in range(4):
+        perms.append(perm)
+        perms.append(tuple(perm[i] for i in reflect))
+        perm = tuple(perm[i] for i in rotate)
+    return tuple(perms)
+
+BOARD_SYMMETRIES = _board_symmetries()
+SYMMETRY_PERMS = np.array(BOARD_SYMMETRIES, dtype=np.intp)
+SYMMETRY_INVERSES = np.argsort(SYMMETRY_PERMS, axis=1)
+
+@lru_cache(maxsize=None)
+def canonicalize(state: int) -> Tuple[int, int]:
+    """Smallest encoded board among the 8 symmetric images of state, with the symmetry index used"""
+    cells = [(state >> (2 * i)) & 3 for i in range(9)]
+    return min((sum(cells[src] << (2 * i) for i, src in enumerate(perm)), index)
+               for index, perm in enumerate(BOARD_SYMMETRIES))
+
+# Packed-board masks: the low bit of every cell is set for X, the high bit for O
+_CELL_LOW_BITS = sum(1 << (2 * i) for i in range(9))
+WIN_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # rows
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # columns
+    (0, 4, 8), (2, 4, 6)              # diagonals
+)
+PACKED_WIN_MASKS = tuple(sum(1 << (2 * cell) for cell in line) for line in WIN_LINES)
+WIN_X = np.array(PACKED_WIN_MASKS, dtype=np.uint32)
+WIN_O = WIN_X << np.uint32(1)
+
+# Bitboards: one 9-bit mask per player, bit i set when that player holds cell i
+FULL_BOARD_MASK = 0x1FF
+WIN_MASKS = tuple(sum(1 << cell for cell in line) for line in WIN_LINES)
+_SPREAD_BITS = tuple(sum(((mask >> i) & 1) << (2 * i) for i in range(9)) for mask in range(1 << 9))
+
+_COMPACT_BITS = {spread: mask for mask, spread in enumerate(_SPREAD_BITS)}
+
+# Whether each 9-bit mask contains a complete line; hot paths index this instead of scanning WIN_MASKS
+HAS_LINE = tuple(any(mask & win == win for win in WIN_MASKS) for mask in range(1 << 9))
+
+def bitboard_wins(mask: int) -> bool:
+    """Whether a player's 9-bit mask contains a complete line"""
+    return HAS_LINE[mask]
+
+# Cells whose addition gives each 9-bit mask a complete line (AND with the free cells before use)
+_COMPLETING_CELLS = tuple(sum(1 << cell for cell in range(9) if bitboard_wins(mask | (1 << cell)))
+                          for mask in range(1 << 9))
+
+def lowest_cell(mask: int) -> int:
+    """Index of the lowest set bit of a non-empty 9-bit mask"""
+    return (mask & -mask).bit_length() - 1
+
+# Set cells of every 9-bit mask in ascending order, so move lists are looked up rather than built
+MASK_CELLS = tuple(tuple(cell for cell in range(9) if mask >> cell & 1) for mask in range(1 << 9))
+
+# Array forms of the bitboard tables for batched play
+_COMPLETING_TABLE = np.array(_COMPLETING_CELLS, dtype=np.int64)
+_LOWEST_CELL_TABLE = np.array([lowest_cell(mask) if mask else -1 for mask in range(1 << 9)], dtype=np.int64)
+_CELL_INDICES = np.arange(9, dtype=np.int64)
+CENTER_MASK = 0b000010000
+CORNER_MASK = 0b101000101
+EDGE_MASK = 0b010101010
+
+def is_terminal(state: int, player_bit: int) -> bool:
+    """Whether the player who just moved (player_bit 0 = X, 1 = O) has won or filled the board"""
+    return (HAS_LINE[_COMPACT_BITS[(state >> player_bit) & _CELL_LOW_BITS]] or
+            (state | (state >> 1)) & _CELL_LOW_BITS == _CELL_LOW_BITS)
+
+def packed_winner(state: int) -> Optional[str]:
+    """Check an encoded board for a winner ('X', 'O', 'Tie' or None)"""
+    x_bits = state & _CELL_LOW_BITS
+    o_bits = (state >> 1) & _CELL_LOW_BITS
+    if HAS_LINE[_COMPACT_BITS[x_bits]]:
+        return 'X'
+    if HAS_LINE[_COMPACT_BITS[o_bits]]:
+        return 'O'
+    if x_bits | o_bits == _CELL_LOW_BITS:
+        return 'Tie'
+    return None
+
+@lru_cache(maxsize=None)
+def bitboard_minimax(x_mask: int, o_mask: int, x_to_move: bool) -> Tuple[int, int]:
+    """Memoized minimax (score, best_move) on bitboards; best_move is -1 when finished"""
+    occupied = x_mask | o_mask
+    # Score by pieces on the board instead of search depth so each position has one value
+    if HAS_LINE[x_mask]:
+        return 10 - bin(occupied).count('1'), -1
+    if HAS_LINE[o_mask]:
+        return bin(occupied).count('1') - 10, -1
+    if occupied == FULL_BOARD_MASK:
+        return 0, -1
+    
+    # Completing a line now is the best score available, so it cuts off the search of the other moves
+    winning = _COMPLETING_CELLS[x_mask if x_to_move else o_mask] & ~occupied
+    if winning:
+        pieces = bin(occupied).count('1') + 1
+        return (10 - pieces if x_to_move else pieces - 10), lowest_cell(winning)
+    
+    best_score = -math.inf if x_to_move else math.inf
+    best_move = -1
+    free = ~occupied & FULL_BOARD_MASK
+    while free:
+        bit = free & -free
+        free ^= bit
+        if x_to_move:
+            score = bitboard_minimax(x_mask | bit, o_mask, False)[0]
+            better = score > best_score
+        else:
+            score = bitboard_minimax(x_mask, o_mask | bit, True)[0]
+            better = score < best_score
+        if better:
+            best_score = score
+            best_move = bit.bit_length() - 1
+    return best_score, best_move
+
+def solve_position(state: int, x_to_move: bool) -> Tuple[int, int]:
+    """Minimax (score, best_move) of an encoded board, via the bitboard search"""
+    return bitboard_minimax(_COMPACT_BITS[state & _CELL_LOW_BITS],
+                            _COMPACT_BITS[(state >> 1) & _CELL_LOW_BITS], x_to_move)
+
+# Best move of every position reachable from the empty board, keyed by position_key
+_POLICY: Dict[int, int] = {}
+
+def position_key(x_mask: int, o_mask: int, x_to_move: bool) -> int:
+    """Collision-free 19-bit position key: x_mask | o_mask | side to move"""
+    return x_mask << 10 | o_mask << 1 | x_to_move
+
+def _build_policy(x_mask: int = 0, o_mask: int = 0, x_to_move: bool = True):
+    """Fill _POLICY by one backward-induction pass over the game tree"""
+    key = position_key(x_mask, o_mask, x_to_move)
+    if key in _POLICY or HAS_LINE[x_mask] or HAS_LINE[o_mask] or x_mask | o_mask == FULL_BOARD_MASK:
+        return
+    _POLICY[key] = bitboard_minimax(x_mask, o_mask, x_to_move)[1]
+    free = ~(x_mask | o_mask) & FULL_BOARD_MASK
+    while free:
+        bit = free & -free
+        free ^= bit
+        if x_to_move:
+            _build_policy(x_mask | bit, o_mask, False)
+        else:
+            _build_policy(x_mask, o_mask | bit, True)
+
+class LRUQTable(OrderedDict):
+    """Q-table that evicts the least recently used states beyond a fixed capacity"""
+    
+    def __init__(self, capacity: int = 200_000):
+        super().__init__()
+        self.capacity = capacity
+    
+    def get(self, state, default=None):
+        """Look up a state's Q-values, marking it as recently used"""
+        q_values = super().get(state)
+        if q_values is None:
+            return default
+        self.move_to_end(state)
+        return q_values
+    
+    def __setitem__(self, state, q_values):
+        super().__setitem__(state, q_values)
+        self.move_to_end(state)
+        if len(self) > self.capacity:
+            self.popitem(last=False)
+
+Q_CACHE_DIR = ".qcache"  # Trained Q-tables reused across runs
+Q_TABLE_FORMAT = 1  # Bump whenever the Q-table type, row layout or state keys change
+
 class QLearningAgent:
-    def __init__(self, learning_rate=0.1, discount_factor=0.9, epsilon=0.1):
-        self.q_table = defaultdict(lambda: defaultdict(float))
+    def __init__(self, learning_rate=0.1, discount_factor=0.9, epsilon=0.1, rng: Optional[random.Random] = None,
+                 max_states: int = 200_000, use_symmetry: bool = True):
+        self.max_states = max_states
+        self.use_symmetry = use_symmetry  # Store symmetric boards under one canonical key
+        self.q_table = LRUQTable(max_states)
+        self._rng = rng or random.Random()
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.epsilon = epsilon
         self.game_history = []
         
-    def get_state_key(self, board: List[str]) -> str:
-        """Convert board state to string key"""
-        return ''.join(board)
+    def settings_tag(self) -> str:
+        """Table format and hyperparameters that shape a trained Q-table, for cache file names"""
+        return (f"v{Q_TABLE_FORMAT}_lr{self.learning_rate}_g{self.discount_factor}_eps{self.epsilon}_"
+                f"{'sym' if self.use_symmetry else 'nosym'}_{self.max_states}")
+    
+    def get_state_key(self, board: List[str]) -> int:
+        """Convert board state to packed integer key"""
+        return encode_board(board)
+    
+    def get_q_values(self, state: int) -> np.ndarray:
+        """Get the Q-values of all 9 actions for a state (read-only for unseen states)"""
+        if self.use_symmetry:
+            key, symmetry = canonicalize(state)
+            return self.q_table.get(key, _ZERO_Q_VALUES)[SYMMETRY_INVERSES[symmetry]]
+        return self.q_table.get(state, _ZERO_Q_VALUES)
     
-    def get_q_value(self, state: str, action: int) -> float:
+    def get_q_value(self, state: int, action: int) -> float:
         """Get Q-value for state-action pair"""
-        return self.q_table[state][action]
+        return float(self.get_q_values(state)[action])
     
-    def update_q_value(self, state: str, action: int, reward: float, next_state: str, available_actions: List[int]):
+    def update_q_value(self, state: int, action: int, reward: float, next_state: int, available_actions: List[int]):
         """Update Q-value using Q-learning formula"""
-        current_q = self.get_q_value(state, action)
+        if self.use_symmetry:
+            state, symmetry = canonicalize(state)
+            action = SYMMETRY_INVERSES[symmetry, action]
+        q_values = self.q_table.get(state)
+        if q_values is None:
+            q_values = self.q_table[state] = np.zeros(9, dtype=np.float32)
+        current_q = q_values[action]
         
         if available_actions:
-            max_next_q = max([self.get_q_value(next_state, a) for a in available_actions])
+            # Python-level max over the row's list form beats fancy-indexing a 9-element array
+            next_q = self.get_q_values(next_state).tolist()
+            max_next_q = np.float32(max(map(next_q.__getitem__, available_actions)))
         else:
             max_next_q = 0
         
-        new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
-        self.q_table[state][action] = new_q
+        q_values[action] = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
     
-    def choose_action(self, state: str, available_actions: List[int], training: bool = True) -> int:
+    def choose_action(self, state: int, available_actions: List[int], training: bool = True) -> int:
         """Choose action using epsilon-greedy policy"""
-        if training and random.random() < self.epsilon:
-            return random.choice(available_actions)
+        if training and self._rng.random() < self.epsilon:
+            return self._rng.choice(available_actions)
         
-        q_values = {action: self.get_q_value(state, action) for action in available_actions}
-        return max(q_values, key=q_values.get)
+        q_values = self.get_q_values(state).tolist()
+        return max(available_actions, key=q_values.__getitem__)
+    
+    def q_value_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Dense (states, Q-values) view of the table with illegal moves set to NaN"""
+        states = np.fromiter(self.q_table.keys(), dtype=np.int64, count=len(self.q_table))
+        if not len(states):
+            return states, np.empty((0, 9), dtype=np.float32)
+        q_values = np.stack(list(self.q_table.values()))
+        q_values[((states[:, None] >> _CELL_SHIFTS) & 3) != 0] = np.nan
+        return states, q_values
+    
+    def extreme_q_values(self, k: int) -> Tuple[List[Tuple[float, int, int]], List[Tuple[float, int, int]]]:
+        """Highest and lowest k learned (legal, nonzero) Q-values as (q_value, state, action), best first"""
+        states, q_values = self.q_value_matrix()
+        flat = q_values.ravel()
+        learned = np.flatnonzero(~np.isnan(flat) & (flat != 0))
+        k = min(k, len(learned))
+        if not k:
+            return [], []
+        values = flat[learned]
+        
+        def entries(indices: np.ndarray) -> List[Tuple[float, int, int]]:
+            indices = indices[np.argsort(-flat[indices], kind='stable')]
+            return [(float(flat[i]), int(states[i // 9]), int(i % 9)) for i in indices]
+        
+        return (entries(learned[np.argpartition(-values, k - 1)[:k]]),
+                entries(learned[np.argpartition(values, k - 1)[:k]]))
     
     def save_q_table(self, filename: str):
         """Save Q-table to file"""
-        q_dict = {state: dict(actions) for state, actions in self.q_table.items()}
-        with open(filename, 'w') as f:
-            json.dump(q_dict, f, indent=2)
+        q_dict = {str(state): q_values.tolist() for state, q_values in self.q_table.items()}
+        write_json(filename, q_dict)
     
     def load_q_table(self, filename: str):
         """Load Q-table from file"""
         try:
-            with open(filename, 'r') as f:
-                q_dict = json.load(f)
-                self.q_table = defaultdict(lambda: defaultdict(float))
-                for state, actions in q_dict.items():
+            q_dict = read_json(filename)
+            self.q_table = LRUQTable(self.max_states)
+            for state, actions in q_dict.items():
+                # Older files keyed states by the 9-char board string
+                key = int(state) if state.isdigit() else encode_board(state)
+                q_values = np.zeros(9, dtype=np.float32)
+                if isinstance(actions, dict):
                     for action, value in actions.items():
-                        self.q_table[state][int(action)] = value
+                        q_values[int(action)] = value
+                else:
+                    q_values[:] = actions
+                if self.use_symmetry:
+                    key, symmetry = canonicalize(key)
+                    q_values = q_values[SYMMETRY_PERMS[symmetry]]
+                self.q_table[key] = q_values
         except FileNotFoundError:
             print(f"Q-table file {filename} not found. Starting with empty Q-table.")
 
 class TicTacToeAI:
-    def __init__(self, strategy_x: Strategy = Strategy.MINIMAX, strategy_o: Strategy = Strategy.MINIMAX):
-        self.board = [' ' for _ in range(9)]
+    def __init__(self, strategy_x: Strategy = Strategy.MINIMAX, strategy_o: Strategy = Strategy.MINIMAX,
+                 seed: Optional[int] = None):
+        self.x_mask = 0  # Cells held by X
+        self.o_mask = 0  # Cells held by O
         self.current_player = 'X'
         self.strategy_x = strategy_x
         self.strategy_o = strategy_o
-        self.q_agent_x = QLearningAgent()
-        self.q_agent_o = QLearningAgent()
+        self._rng = random.Random(seed)  # Shared by all randomized strategies of this instance
+        self.q_agent_x = QLearningAgent(rng=self._rng)
+        self.q_agent_o = QLearningAgent(rng=self._rng)
         self.game_states = []  # Track states for learning
         self.data_collector = GameplayDataCollector()  # For training data collection
         self.current_game_moves = []  # Track moves for current game
-        
-    def reset_board(self):
+        self.record_pool: Optional[GameRecordPool] = None  # Rent record shells when set; the caller releases them
+        self._state_version = 0  # Bumped on every board change
+        self._cached_version = -1
+        self._cached_state = (0, [])
+        self._strategy_moves = {strategy: getattr(self, name)
+                                for strategy, name in self._STRATEGY_MOVE_METHODS.items()}
+        
+    @property
+    def board(self) -> List[str]:
+        """List-of-cells view of the bitboards, built on demand (mutating it does not change the game)"""
+        x_mask, o_mask = self.x_mask, self.o_mask
+        return ['X' if x_mask >> i & 1 else 'O' if o_mask >> i & 1 else ' ' for i in range(9)]
+    
+    @board.setter
+    def board(self, cells) -> None:
+        self.x_mask = sum(1 << i for i, cell in enumerate(cells) if cell == 'X')
+        self.o_mask = sum(1 << i for i, cell in enumerate(cells) if cell == 'O')
+        self._state_version += 1
+    
+    def reset_board(self) -> None:
         """Reset the game board"""
-        self.board = [' ' for _ in range(9)]
+        self.x_mask = 0
+        self.o_mask = 0
         self.current_player = 'X'
+        self._state_version += 1
+    
+    def set_strategies(self, strategy_x: Strategy, strategy_o: Strategy) -> None:
+        """Switch matchups on this engine, keeping its caches and Q-tables and clearing only the board"""
+        self.strategy_x = strategy_x
+        self.strategy_o = strategy_o
+        self.reset_board()
+    
+    def packed_state(self) -> int:
+        """Get the board as a packed 18-bit key (same encoding as encode_board)"""
+        return _SPREAD_BITS[self.x_mask] | (_SPREAD_BITS[self.o_mask] << 1)
+    
+    def get_cached_state(self) -> Tuple[int, List[int]]:
+        """Get the packed board key and available moves, recomputed only after a move"""
+        if self._cached_version != self._state_version:
+            self._cached_state = (self.packed_state(), self.get_available_moves())
+            self._cached_version = self._state_version
+        return self._cached_state
     
-    def print_board(self):
+    def print_board(self) -> None:
         """Print the current board state"""
+        board = self.board
         print("\n" + "-" * 13)
         for i in range(3):
-            row = self.board[i*3:(i+1)*3]
+            row = board[i*3:(i+1)*3]
             print(f"| {row[0]} | {row[1]} | {row[2]} |")
             print("-" * 13)
     
     def is_valid_move(self, position: int) -> bool:
         """Check if a move is valid"""
-        return 0 <= position < 9 and self.board[position] == ' '
+        return 0 <= position < 9 and not ((self.x_mask | self.o_mask) >> position) & 1
     
     def make_move(self, position: int, player: str) -> bool:
         """Make a move on the board"""
         if self.is_valid_move(position):
-            self.board[position] = player
+            if player == 'X':
+                self.x_mask |= 1 << position
+            else:
+                self.o_mask |= 1 << position
+            self._state_version += 1
             return True
         return False
     
     def check_winner(self) -> Optional[str]:
         """Check if there's a winner"""
-        # Winning combinations
-        wins = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
-            [0, 4, 8], [2, 4, 6]              # diagonals
-        ]
-        
-        for combo in wins:
-            if (self.board[combo[0]] == self.board[combo[1]] == 
-                self.board[combo[2]] != ' '):
-                return self.board[combo[0]]
+        x_mask, o_mask = self.x_mask, self.o_mask
+        if HAS_LINE[x_mask]:
+            return 'X'
+        if HAS_LINE[o_mask]:
+            return 'O'
         
         # Check for tie
-        if ' ' not in self.board:
+        if x_mask | o_mask == FULL_BOARD_MASK:
             return 'Tie'
         
         return None
     
     def get_available_moves(self) -> List[int]:
         """Get list of available moves"""
-        return [i for i in range(9) if self.board[i] == ' ']
+        return list(MASK_CELLS[~(self.x_mask | self.o_mask) & FULL_BOARD_MASK])
     
     def minimax(self, depth: int, is_maximizing: bool, alpha: float = -math.inf, beta: float = math.inf) -> int:
-        """Minimax algorithm with alpha-beta pruning"""
-        winner = self.check_winner()
-        
-        if winner == 'X':
-            return 10 - depth
-        elif winner == 'O':
-            return depth - 10
-        elif winner == 'Tie':
-            return 0
-        
-        if is_maximizing:
-            max_eval = -math.inf
-            for move in self.get_available_moves():
-                self.board[move] = 'X'
-                eval_score = self.minimax(depth + 1, False, alpha, beta)
-                self.board[move] = ' '
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval
-        else:
-            min_eval = math.inf
-            for move in self.get_available_moves():
-                self.board[move] = 'O'
-                eval_score = self.minimax(depth + 1, True, alpha, beta)
-                self.board[move] = ' '
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval
+        """Minimax score via the bitboard_minimax transposition table (exact for any alpha/beta window)"""
+        score = bitboard_minimax(self.x_mask, self.o_mask, is_maximizing)[0]
+        # Cached scores count pieces on the board; re-score wins by plies from this search depth
+        shift = bin(self.x_mask | self.o_mask).count('1') - depth
+        if score > 0:
+            return score + shift
+        if score < 0:
+            return score - shift
+        return 0
     
     def get_best_move(self, player: str) -> int:
-        """Get the best move using minimax"""
-        best_score = -math.inf if player == 'X' else math.inf
-        best_move = -1
-        
-        for move in self.get_available_moves():
-            self.board[move] = player
-            score = self.minimax(0, player == 'O')
-            self.board[move] = ' '
-            
-            if player == 'X' and score > best_score:
-                best_score = score
-                best_move = move
-            elif player == 'O' and score < best_score:
-                best_score = score
-                best_move = move
-        
-        return best_move
+        """Get the best move from the precomputed minimax policy"""
+        if not _POLICY:
+            _build_policy()
+        move = _POLICY.get(self.x_mask << 10 | self.o_mask << 1 | (player == 'X'))  # Inlined position_key
+        if move is None:  # Finished or unreachable position (e.g. the wrong side to move)
+            move = bitboard_minimax(self.x_mask, self.o_mask, player == 'X')[1]
+        return move
     
-    def get_random_move(self) -> int:
-        """Get a random valid move"""
-        return random.choice(self.get_available_moves())
+    def get_random_move(self, player: Optional[str] = None) -> int:
+        """Get a random valid move (player is accepted for a uniform strategy signature)"""
+        return self._rng.choice(MASK_CELLS[~(self.x_mask | self.o_mask) & FULL_BOARD_MASK])
     
     def get_aggressive_move(self, player: str) -> int:
         """Aggressive strategy: prioritize winning moves, then center, then corners"""
-        available = self.get_available_moves()
-        
         # First, check for winning moves
-        for move in available:
-            self.board[move] = player
-            if self.check_winner() == player:
-                self.board[move] = ' '
-                return move
-            self.board[move] = ' '
+        free = ~(self.x_mask | self.o_mask) & FULL_BOARD_MASK
+        winning = _COMPLETING_CELLS[self.x_mask if player == 'X' else self.o_mask] & free
+        if winning:
+            return lowest_cell(winning)
         
         # Then prioritize center
-        if 4 in available:
+        if free & CENTER_MASK:
             return 4
         
-        # Then corners
-        corners = [0, 2, 6, 8]
-        corner_moves = [m for m in available if m in corners]
-        if corner_moves:
-            return random.choice(corner_moves)
-        
-        # Finally, any available move
-        return random.choice(available)
+        # Then corners, and finally any available move
+        return self._rng.choice(MASK_CELLS[free & CORNER_MASK or free])
     
     def get_defensive_move(self, player: str) -> int:
         """Defensive strategy: block opponent wins, then play safe"""
-        available = self.get_available_moves()
-        opponent = 'O' if player == 'X' else 'X'
+        own_mask, opponent_mask = (self.x_mask, self.o_mask) if player == 'X' else (self.o_mask, self.x_mask)
+        free = ~(own_mask | opponent_mask) & FULL_BOARD_MASK
         
         # First, check for blocking moves
-        for move in available:
-            self.board[move] = opponent
-            if self.check_winner() == opponent:
-                self.board[move] = ' '
-                return move
-            self.board[move] = ' '
+        blocking = _COMPLETING_CELLS[opponent_mask] & free
+        if blocking:
+            return lowest_cell(blocking)
         
         # Then check for our winning moves
-        for move in available:
-            self.board[move] = player
-            if self.check_winner() == player:
-                self.board[move] = ' '
-                return move
-            self.board[move] = ' '
+        winning = _COMPLETING_CELLS[own_mask] & free
+        if winning:
+            return lowest_cell(winning)
         
         # Play center if available
-        if 4 in available:
+        if free & CENTER_MASK:
             return 4
         
-        # Play edges (safer than corners)
-        edges = [1, 3, 5, 7]
-        edge_moves = [m for m in available if m in edges]
-        if edge_moves:
-            return random.choice(edge_moves)
-        
-        return random.choice(available)
+        # Play edges (safer than corners), else any available move
+        return self._rng.choice(MASK_CELLS[free & EDGE_MASK or free])
     
     def get_hybrid_move(self, player: str) -> int:
         """Hybrid strategy: mix of minimax and heuristics"""
-        available = self.get_available_moves()
-        
         # Early game: use heuristics
-        if len(available) > 6:
+        if len(MASK_CELLS[~(self.x_mask | self.o_mask) & FULL_BOARD_MASK]) > 6:
             return self.get_aggressive_move(player)
         # Late game: use minimax
         else:
             return self.get_best_move(player)
     
+    # Move method of each strategy that needs only the player (Q-learning also needs the training flag);
+    # bound per instance in __init__ so subclass overrides are dispatched to
+    _STRATEGY_MOVE_METHODS = {
+        Strategy.MINIMAX: 'get_best_move',
+        Strategy.RANDOM: 'get_random_move',
+        Strategy.AGGRESSIVE: 'get_aggressive_move',
+        Strategy.DEFENSIVE: 'get_defensive_move',
+        Strategy.HYBRID: 'get_hybrid_move',
+    }
+    
     def get_move_by_strategy(self, player: str, strategy: Strategy, training: bool = False) -> int:
         """Get move based on specified strategy"""
-        if strategy == Strategy.MINIMAX:
-            return self.get_best_move(player)
-        elif strategy == Strategy.Q_LEARNING:
+        if strategy is Strategy.Q_LEARNING:
             agent = self.q_agent_x if player == 'X' else self.q_agent_o
-            state = agent.get_state_key(self.board)
-            return agent.choose_action(state, self.get_available_moves(), training)
-        elif strategy == Strategy.RANDOM:
-            return self.get_random_move()
-        elif strategy == Strategy.AGGRESSIVE:
-            return self.get_aggressive_move(player)
-        elif strategy == Strategy.DEFENSIVE:
-            return self.get_defensive_move(player)
-        elif strategy == Strategy.HYBRID:
-            return self.get_hybrid_move(player)
-        else:
-            return self.get_best_move(player)
+            state, available = self.get_cached_state()
+            return agent.choose_action(state, available, training)
+        return self._strategy_moves.get(strategy, self.get_best_move)(player)
     
-    def update_q_learning(self, winner: str):
+    def update_q_learning(self, winner: str) -> None:
         """Update Q-learning agents based on game outcome"""
         # Define rewards
         rewards = {'X': 1, 'O': -1, 'Tie': 0}
@@ -426,8 +937,7 @@ class TicTacToeAI:
             if i + 1 < len(self.game_states):
                 next_state = self.game_states[i + 1][0]
                 # Find available actions in next state
-                next_board = list(next_state)
-                next_available = [j for j in range(9) if next_board[j] == ' ']
+                next_available = available_moves_from_key(next_state)
             else:
                 next_state = state
                 next_available = []
@@ -439,31 +949,28 @@ class TicTacToeAI:
         self.reset_board()
         self.game_states = []
         self.current_game_moves = []
-        game_start_time = datetime.now()
+        game_start_time = time.time_ns()
+        learning = training and Strategy.Q_LEARNING in (self.strategy_x, self.strategy_o)
         
         while True:
+            strategy = self.strategy_x if self.current_player == 'X' else self.strategy_o
             if show_board:
                 self.print_board()
-                strategy = self.strategy_x if self.current_player == 'X' else self.strategy_o
                 print(f"Player {self.current_player}'s turn ({strategy.value})")
             
-            # Record current board state
-            current_state = ''.join(self.board)
-            
             # Record state for Q-learning
-            if training and (self.strategy_x == Strategy.Q_LEARNING or self.strategy_o == Strategy.Q_LEARNING):
-                state = current_state
+            if learning:
+                state = self.get_cached_state()[0]
             
             # Get move based on player's strategy
-            strategy = self.strategy_x if self.current_player == 'X' else self.strategy_o
             move = self.get_move_by_strategy(self.current_player, strategy, training)
             
             # Record move for training data collection
             if collect_data:
-                self.current_game_moves.append((current_state, move, self.current_player))
+                self.current_game_moves.append(MOVE_TUPLES[self.current_player][move])
             
             # Record state-action pair for learning
-            if training and (self.strategy_x == Strategy.Q_LEARNING or self.strategy_o == Strategy.Q_LEARNING):
+            if learning:
                 self.game_states.append((state, move, self.current_player))
             
             self.make_move(move, self.current_player)
@@ -476,19 +983,20 @@ class TicTacToeAI:
                     print(f"Game Over! Winner: {winner}")
                 
                 # Update Q-learning if training
-                if training and (self.strategy_x == Strategy.Q_LEARNING or self.strategy_o == Strategy.Q_LEARNING):
+                if learning:
                     self.update_q_learning(winner)
                 
                 # Collect training data
                 if collect_data:
-                    game_record = GameRecord(
+                    make_record = self.record_pool.rent if self.record_pool is not None else GameRecord
+                    game_record = make_record(
                         game_id=self.data_collector.current_game_id,
                         player_x_strategy=self.strategy_x.value,
                         player_o_strategy=self.strategy_o.value,
                         moves=self.current_game_moves,
                         winner=winner,
                         game_length=len(self.current_game_moves),
-                        timestamp=game_start_time.isoformat()
+                        timestamp=game_start_time
                     )
                     self.data_collector.record_game(game_record)
                     self.data_collector.current_game_id += 1
@@ -498,6 +1006,47 @@ class TicTacToeAI:
             # Switch players
             self.current_player = 'O' if self.current_player == 'X' else 'X'
     
+    def play_packed_training_game(self) -> str:
+        """Play one training game entirely on the packed board (Q-learning and random players only)"""
+        state = 0
+        player = 'X'
+        game_states = []
+        
+        while True:
+            available = available_moves_from_key(state)
+            if (self.strategy_x if player == 'X' else self.strategy_o) == Strategy.Q_LEARNING:
+                agent = self.q_agent_x if player == 'X' else self.q_agent_o
+                move = agent.choose_action(state, available, True)
+            else:
+                move = self._rng.choice(available)
+            
+            game_states.append((state, move, player))
+            state |= CELL_CODES[player] << (2 * move)
+            
+            if is_terminal(state, player == 'O'):
+                winner = packed_winner(state)
+                self.game_states = game_states
+                self.update_q_learning(winner)
+                self.board = decode_board(state)
+                self.current_player = player
+                return winner
+            
+            player = 'O' if player == 'X' else 'X'
+    
+    def record_game_copy(self, record: GameRecord) -> None:
+        """Record another occurrence of a finished game under the next game id"""
+        collector = self.data_collector
+        if self.record_pool is not None:
+            # Pooled records own their move lists, so the pool copies the moves in
+            copy = self.record_pool.rent(record.moves, game_id=collector.current_game_id,
+                                         player_x_strategy=record.player_x_strategy,
+                                         player_o_strategy=record.player_o_strategy, winner=record.winner,
+                                         game_length=record.game_length, timestamp=time.time_ns())
+        else:
+            copy = replace(record, game_id=collector.current_game_id, timestamp=time.time_ns())
+        collector.record_game(copy)
+        collector.current_game_id += 1
+    
     def run_self_play_tournament(self, num_games: int = 100, training: bool = False) -> dict:
         """Run multiple self-play games and collect statistics"""
         results = {'X': 0, 'O': 0, 'Tie': 0}
@@ -521,7 +1070,95 @@ class TicTacToeAI:
         
         return results
     
-    def train_q_learning_agent(self, episodes: int = 1000, opponent_strategy: Strategy = Strategy.RANDOM):
+    def run_batch_tournament(self, num_games: int = 100) -> dict:
+        """Run non-training games all at once, one vectorized step per ply"""
+        print(f"Running {num_games} self-play games (batched)...")
+        print(f"X Strategy: {self.strategy_x.value}, O Strategy: {self.strategy_o.value}")
+        
+        if is_deterministic(self.strategy_x) and is_deterministic(self.strategy_o):
+            # Every game would replay the same moves, so play one and count it num_games times
+            results = {'X': 0, 'O': 0, 'Tie': 0}
+            results[self.play_self_game()] = num_games
+            return self._print_tournament_results(results, num_games)
+        
+        np_rng = np.random.default_rng(self._rng.getrandbits(64))
+        states = np.zeros(num_games, dtype=np.int64)
+        masks = np.zeros((2, num_games), dtype=np.int64)  # X and O bitboards
+        winners = np.full(num_games, -1, dtype=np.int8)  # 0 = X, 1 = O, 2 = Tie
+        
+        for ply in range(9):
+            active = np.flatnonzero(winners < 0)
+            if not len(active):
+                break
+            player = 'X' if ply % 2 == 0 else 'O'
+            strategy = self.strategy_x if player == 'X' else self.strategy_o
+            current = states[active]
+            own, opponent = masks[ply % 2, active], masks[1 - ply % 2, active]
+            free = ~(own | opponent) & FULL_BOARD_MASK
+            
+            if strategy == Strategy.RANDOM:
+                moves = self._random_cells(free, np_rng)
+            elif strategy == Strategy.Q_LEARNING:
+                agent = self.q_agent_x if player == 'X' else self.q_agent_o
+                moves = self._solve_unique(current, lambda state: agent.choose_action(
+                    state, available_moves_from_key(state), False))
+            elif strategy == Strategy.MINIMAX or (strategy == Strategy.HYBRID and ply >= 3):
+                # Hybrid switches to minimax once at most 6 cells are free
+                moves = self._solve_unique(current, lambda state: solve_position(state, player == 'X')[1])
+            else:
+                moves = self._heuristic_cells(Strategy.AGGRESSIVE if strategy == Strategy.HYBRID else strategy,
+                                              own, opponent, free, np_rng)
+            
+            current |= CELL_CODES[player] << (2 * moves)
+            states[active] = current
+            masks[ply % 2, active] = own | (1 << moves)
+            
+            boards = current[:, None]
+            x_won = ((boards & WIN_X) == WIN_X).any(axis=1)
+            o_won = ((boards & WIN_O) == WIN_O).any(axis=1)
+            full = ((current | (current >> 1)) & _CELL_LOW_BITS) == _CELL_LOW_BITS
+            winners[active] = np.select([x_won, o_won, full], [0, 1, 2], -1)
+        
+        counts = np.bincount(winners, minlength=3)
+        results = {'X': int(counts[0]), 'O': int(counts[1]), 'Tie': int(counts[2])}
+        return self._print_tournament_results(results, num_games)
+    
+    @staticmethod
+    def _solve_unique(states: np.ndarray, choose) -> np.ndarray:
+        """Moves of a deterministic policy for many packed boards, calling it once per distinct board"""
+        unique_states, inverse = np.unique(states, return_inverse=True)
+        return np.array([choose(state) for state in unique_states.tolist()], dtype=np.int64)[inverse]
+    
+    @staticmethod
+    def _random_cells(options: np.ndarray, np_rng: np.random.Generator) -> np.ndarray:
+        """A uniformly random set cell of each 9-bit mask (-1 rows are not expected)"""
+        scores = np_rng.random((len(options), 9))
+        scores[((options[:, None] >> _CELL_INDICES) & 1) == 0] = -1
+        return scores.argmax(axis=1)
+    
+    def _heuristic_cells(self, strategy: Strategy, own: np.ndarray, opponent: np.ndarray, free: np.ndarray,
+                         np_rng: np.random.Generator) -> np.ndarray:
+        """Batched get_aggressive_move / get_defensive_move over bitboard arrays"""
+        winning = _COMPLETING_TABLE[own] & free
+        if strategy == Strategy.AGGRESSIVE:
+            forced, preferred = winning, free & CORNER_MASK
+        else:
+            blocking = _COMPLETING_TABLE[opponent] & free
+            forced, preferred = np.where(blocking != 0, blocking, winning), free & EDGE_MASK
+        forced = np.where(forced != 0, forced, free & CENTER_MASK)  # Then the center
+        random_moves = self._random_cells(np.where(preferred != 0, preferred, free), np_rng)
+        return np.where(forced != 0, _LOWEST_CELL_TABLE[forced], random_moves)
+    
+    def _print_tournament_results(self, results: dict, num_games: int) -> dict:
+        """Print a tournament summary and pass the results through"""
+        print("\n=== Tournament Results ===")
+        print(f"X wins: {results['X']} ({results['X']/num_games*100:.1f}%)")
+        print(f"O wins: {results['O']} ({results['O']/num_games*100:.1f}%)")
+        print(f"Ties: {results['Tie']} ({results['Tie']/num_games*100:.1f}%)")
+        
+        return results
+    
+    def train_q_learning_agent(self, episodes: int = 1000, opponent_strategy: Strategy = Strategy.RANDOM) -> None:
         """Train Q-learning agent against different opponents"""
         print(f"Training Q-learning agent for {episodes} episodes against {opponent_strategy.value}")
         
@@ -529,26 +1166,29 @@ class TicTacToeAI:
         original_x = self.strategy_x
         original_o = self.strategy_o
         
-        self.strategy_x = Strategy.Q_LEARNING
-        self.strategy_o = opponent_strategy
+        self.set_strategies(Strategy.Q_LEARNING, opponent_strategy)
+        
+        # Training phase; opponents that need no board-list heuristics play on the packed board
+        if opponent_strategy in (Strategy.RANDOM, Strategy.Q_LEARNING):
+            play_episode = self.play_packed_training_game
+        else:
+            play_episode = lambda: self.play_self_game(training=True)
         
-        # Training phase
         results = {'X': 0, 'O': 0, 'Tie': 0}
         for i in range(episodes):
             if (i + 1) % 100 == 0:
                 print(f"Training episode {i + 1}/{episodes}")
             
-            winner = self.play_self_game(training=True)
+            winner = play_episode()
             results[winner] += 1
         
         print(f"\nTraining completed!")
         print(f"Training results - X: {results['X']}, O: {results['O']}, Ties: {results['Tie']}")
         
         # Restore original strategies
-        self.strategy_x = original_x
-        self.strategy_o = original_o
+        self.set_strategies(original_x, original_o)
     
-    def evaluate_strategies(self, strategies: List[Strategy], num_games: int = 50):
+    def evaluate_strategies(self, strategies: List[Strategy], num_games: int = 50) -> Dict:
         """Evaluate different strategies against each other"""
         print("=== Strategy Evaluation ===")
         results = {}
@@ -559,28 +1199,27 @@ class TicTacToeAI:
                     print(f"\n{strat_x.value} vs {strat_o.value}")
                     
                     # Set strategies
-                    self.strategy_x = strat_x
-                    self.strategy_o = strat_o
+                    self.set_strategies(strat_x, strat_o)
                     
                     # Run games
-                    game_results = self.run_self_play_tournament(num_games)
+                    game_results = self.run_batch_tournament(num_games)
                     results[f"{strat_x.value}_vs_{strat_o.value}"] = game_results
         
         return results
     
-    def save_q_tables(self, prefix: str = "q_table"):
+    def save_q_tables(self, prefix: str = "q_table") -> None:
         """Save Q-tables for both agents"""
         self.q_agent_x.save_q_table(f"{prefix}_x.json")
         self.q_agent_o.save_q_table(f"{prefix}_o.json")
         print(f"Q-tables saved as {prefix}_x.json and {prefix}_o.json")
     
-    def load_q_tables(self, prefix: str = "q_table"):
+    def load_q_tables(self, prefix: str = "q_table") -> None:
         """Load Q-tables for both agents"""
         self.q_agent_x.load_q_table(f"{prefix}_x.json")
         self.q_agent_o.load_q_table(f"{prefix}_o.json")
         print(f"Q-tables loaded from {prefix}_x.json and {prefix}_o.json")
     
-    def play_interactive_game(self):
+    def play_interactive_game(self) -> None:
         """Play an interactive game against the AI"""
         print("=== Interactive Game vs AI ===")
         print("You are X, AI is O")
@@ -623,8 +1262,15 @@ class TicTacToeAI:
             self.current_player = 'O' if self.current_player == 'X' else 'X'
     
     def generate_training_data(self, strategy_pairs: List[Tuple[Strategy, Strategy]], 
-                             games_per_pair: int = 100, export_format: str = "both") -> Dict:
-        """Generate comprehensive training data from AI vs AI gameplay"""
+                             games_per_pair: int = 100, export_format: str = "both", workers: int = 1,
+                             stream: bool = False, early_stop_ci: Optional[float] = None) -> Dict:
+        """Generate comprehensive training data from AI vs AI gameplay (workers > 1 plays in subprocesses)
+        
+        With stream=True games are written to disk as they are played instead of being kept in
+        memory; the "json" format is then written as JSON lines (.jsonl).
+        With early_stop_ci set (single process only), matchups take turns one game at a time and
+        play stops once every matchup's X win rate has a 95% interval narrower than early_stop_ci.
+        """
         print("🎯 Generating Training Data from AI vs AI Gameplay")
         print("=" * 60)
         
@@ -634,43 +1280,127 @@ class TicTacToeAI:
         
         # Reset data collector
         self.data_collector = GameplayDataCollector()
-        
-        start_time = time.time()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        start_time = time.perf_counter()
         games_played = 0
-        
-        for i, (strat_x, strat_o) in enumerate(strategy_pairs):
-            print(f"\n📊 Matchup {i+1}/{len(strategy_pairs)}: {strat_x.value} vs {strat_o.value}")
-            
-            # Set strategies
-            self.strategy_x = strat_x
-            self.strategy_o = strat_o
+        # The finally block closes any streamed files (writing the JSONL trailer) even if play fails
+        try:
+            if stream:
+                self.data_collector.stream_to(
+                    f"training_data_{timestamp}.csv" if export_format in ["csv", "both"] else None,
+                    f"training_data_{timestamp}.jsonl" if export_format in ["json", "both"] else None)
+            if workers > 1:
+                games_played = self._play_pairs_in_workers(strategy_pairs, games_per_pair, workers, start_time)
+                strategy_pairs = []
+            elif early_stop_ci is not None:
+                games_played = self._play_pairs_interleaved(strategy_pairs, games_per_pair, early_stop_ci,
+                                                            start_time)
+                strategy_pairs = []
             
-            # Play games and collect data
-            for j in range(games_per_pair):
-                self.play_self_game(collect_data=True)
-                games_played += 1
+            for i, (strat_x, strat_o) in enumerate(strategy_pairs):
+                print(f"\n📊 Matchup {i+1}/{len(strategy_pairs)}: {strat_x.value} vs {strat_o.value}")
                 
-                if games_played % 50 == 0:
-                    elapsed = time.time() - start_time
-                    print(f"  Progress: {games_played}/{total_games} games ({games_played/total_games*100:.1f}%) - {elapsed:.1f}s")
+                # Set strategies
+                self.set_strategies(strat_x, strat_o)
+                # Deterministic pairs replay the same game, so later ones copy the first record
+                repeat_first = is_deterministic(strat_x) and is_deterministic(strat_o)
+                
+                # Play games and collect data
+                for j in range(games_per_pair):
+                    if repeat_first and j:
+                        self.record_game_copy(first_record)
+                    else:
+                        self.play_self_game(collect_data=True)
+                        first_record = self.data_collector.last_record
+                    games_played += 1
+                    
+                    if games_played % 50 == 0:
+                        elapsed = time.perf_counter() - start_time
+                        print(f"  Progress: {games_played}/{total_games} games "
+                              f"({games_played/total_games*100:.1f}%) - {elapsed:.1f}s")
+        finally:
+            self.data_collector.close_streams()
         
         # Generate statistics
         stats = self.data_collector.get_statistics()
         
-        # Export data
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        if export_format in ["csv", "both"]:
-            self.data_collector.export_to_csv(f"training_data_{timestamp}.csv")
-        if export_format in ["json", "both"]:
-            self.data_collector.export_to_json(f"training_data_{timestamp}.json")
+        # Export data; both files are written concurrently so one's disk writes overlap the other's encoding
+        if not stream:
+            exports = []
+            if export_format in ["csv", "both"]:
+                exports.append((self.data_collector.export_to_csv, f"training_data_{timestamp}.csv"))
+            if export_format in ["json", "both"]:
+                exports.append((self.data_collector.export_to_json, f"training_data_{timestamp}.json"))
+            with ThreadPoolExecutor(max_workers=max(len(exports), 1)) as pool:
+                for export in [pool.submit(export, filename) for export, filename in exports]:
+                    export.result()
         
         print(f"\n✅ Training data generation completed!")
-        print(f"Total time: {time.time() - start_time:.1f} seconds")
-        print(f"Games per second: {games_played/(time.time() - start_time):.1f}")
+        print(f"Total time: {time.perf_counter() - start_time:.1f} seconds")
+        print(f"Games per second: {games_played/(time.perf_counter() - start_time):.1f}")
         
         return stats
     
-    def run_comprehensive_ai_tournament(self, num_games_per_matchup: int = 50) -> Dict:
+    def _play_pairs_interleaved(self, strategy_pairs: List[Tuple[Strategy, Strategy]], games_per_pair: int,
+                                early_stop_ci: float, start_time: float) -> int:
+        """Play rounds of one game per matchup until games_per_pair rounds or every interval is narrow enough"""
+        collector = self.data_collector
+        total_games = len(strategy_pairs) * games_per_pair
+        repeat_first = [is_deterministic(strat_x) and is_deterministic(strat_o) for strat_x, strat_o in strategy_pairs]
+        first_records = [None] * len(strategy_pairs)
+        x_wins = np.zeros(len(strategy_pairs))
+        games_played = 0
+        
+        for round_number in range(1, games_per_pair + 1):
+            for i, (strat_x, strat_o) in enumerate(strategy_pairs):
+                self.set_strategies(strat_x, strat_o)
+                if repeat_first[i] and first_records[i] is not None:
+                    self.record_game_copy(first_records[i])
+                    winner = first_records[i].winner
+                else:
+                    winner = self.play_self_game(collect_data=True)
+                    first_records[i] = collector.last_record
+                x_wins[i] += winner == 'X'
+                games_played += 1
+                
+                if games_played % 50 == 0:
+                    elapsed = time.perf_counter() - start_time
+                    print(f"  Progress: {games_played}/{total_games} games ({games_played/total_games*100:.1f}%) - {elapsed:.1f}s")
+            
+            if round_number < games_per_pair and wilson_interval_width(x_wins, round_number).max() < early_stop_ci:
+                print(f"  ⏹️  Every matchup's win-rate interval is narrower than {early_stop_ci} after {round_number} games each; stopping early")
+                break
+        
+        return games_played
+    
+    def _play_pairs_in_workers(self, strategy_pairs: List[Tuple[Strategy, Strategy]], games_per_pair: int,
+                               workers: int, start_time: float) -> int:
+        """Play every matchup in worker processes, collecting the records in matchup order"""
+        collector = self.data_collector
+        total_games = len(strategy_pairs) * games_per_pair
+        tasks = []
+        for strat_x, strat_o in strategy_pairs:
+            for first in range(0, games_per_pair, GAMES_PER_WORKER_TASK):
+                num_games = min(GAMES_PER_WORKER_TASK, games_per_pair - first)
+                tasks.append((strat_x, strat_o, num_games, collector.current_game_id, self._rng.getrandbits(64)))
+                collector.current_game_id += num_games
+        
+        # Workers play with this instance's Q-tables
+        with ProcessPoolExecutor(workers, initializer=_init_game_worker,
+                                 initargs=(self.q_agent_x.q_table, self.q_agent_o.q_table)) as pool:
+            for records in pool.map(_play_game_chunk, *zip(*tasks)):
+                for record in records:
+                    collector.record_game(record)
+                elapsed = time.perf_counter() - start_time
+                print(f"  Progress: {collector.total_games()}/{total_games} games "
+                      f"({collector.total_games()/total_games*100:.1f}%) - {elapsed:.1f}s")
+        
+        if strategy_pairs:
+            self.set_strategies(*strategy_pairs[-1])
+        return collector.total_games()
+    
+    def run_comprehensive_ai_tournament(self, num_games_per_matchup: int = 50, workers: int = 1,
+                                        early_stop_ci: Optional[float] = None) -> Dict:
         """Run a comprehensive tournament between all AI strategies"""
         print("🏆 Comprehensive AI vs AI Tournament")
         print("=" * 60)
@@ -688,14 +1418,15 @@ class TicTacToeAI:
         print(f"Each matchup plays {num_games_per_matchup} games")
         
         # Generate training data from tournament
-        stats = self.generate_training_data(strategy_pairs, num_games_per_matchup)
+        stats = self.generate_training_data(strategy_pairs, num_games_per_matchup, workers=workers,
+                                            early_stop_ci=early_stop_ci)
         
         # Print comprehensive results
         self.print_tournament_analysis(stats)
         
         return stats
     
-    def print_tournament_analysis(self, stats: Dict):
+    def print_tournament_analysis(self, stats: Dict) -> None:
         """Print detailed analysis of tournament results"""
         print("\n" + "=" * 60)
         print("📈 TOURNAMENT ANALYSIS")
@@ -725,7 +1456,7 @@ class TicTacToeAI:
             print(f"  {length} moves: {count:4} games ({percentage:4.1f}%)")
     
     def create_custom_training_dataset(self, focus_strategies: List[Strategy], 
-                                     games_per_strategy: int = 200) -> Dict:
+                                     games_per_strategy: int = 200, workers: int = 1) -> Dict:
         """Create a focused training dataset with specific strategies"""
         print(f"🎯 Creating Custom Training Dataset")
         print(f"Focus strategies: {[s.value for s in focus_strategies]}")
@@ -747,62 +1478,44 @@ class TicTacToeAI:
                 strategy_pairs.append((strat, Strategy.RANDOM))
                 strategy_pairs.append((Strategy.RANDOM, strat))
         
-        # Remove duplicates while preserving order
+        # Remove duplicates (in either seat order) while preserving order
         unique_pairs = []
         seen = set()
         for pair in strategy_pairs:
-            if pair not in seen and (pair[1], pair[0]) not in seen:
+            matchup = frozenset(pair)
+            if matchup not in seen:
                 unique_pairs.append(pair)
-                seen.add(pair)
+                seen.add(matchup)
         
-        return self.generate_training_data(unique_pairs, games_per_strategy)
+        return self.generate_training_data(unique_pairs, games_per_strategy, workers=workers)
     
     def analyze_gameplay_patterns(self) -> Dict:
         """Analyze patterns in the collected gameplay data"""
-        if not self.data_collector.games_data:
+        num_games = self.data_collector.total_games()
+        if not num_games:
             return {"error": "No gameplay data available"}
         
         print("🔍 Analyzing Gameplay Patterns")
         print("=" * 40)
         
+        columns = self.data_collector.game_columns()
         patterns = {
-            'opening_moves': defaultdict(int),
+            'opening_moves': Counter(move for move in columns.first_moves if move is not None),
             'winning_sequences': defaultdict(int),
             'strategy_effectiveness': defaultdict(lambda: {'wins': 0, 'games': 0}),
-            'common_endgames': defaultdict(int)
+            'common_endgames': Counter(columns.game_lengths)
         }
         
-        for game in self.data_collector.games_data:
-            # Opening move analysis
-            if game.moves:
-                first_move = game.moves[0][1]  # First move position
-                patterns['opening_moves'][first_move] += 1
-            
-            # Strategy effectiveness
-            x_strat = game.player_x_strategy
-            o_strat = game.player_o_strategy
-            
-            patterns['strategy_effectiveness'][x_strat]['games'] += 1
-            patterns['strategy_effectiveness'][o_strat]['games'] += 1
-            
-            if game.winner == 'X':
-                patterns['strategy_effectiveness'][x_strat]['wins'] += 1
-            elif game.winner == 'O':
-                patterns['strategy_effectiveness'][o_strat]['wins'] += 1
-            
-            # Game length patterns
-            patterns['common_endgames'][game.game_length] += 1
-        
-        # Calculate win rates
-        for strategy in patterns['strategy_effectiveness']:
-            data = patterns['strategy_effectiveness'][strategy]
-            if data['games'] > 0:
-                data['win_rate'] = data['wins'] / data['games'] * 100
+        # Strategy effectiveness and win rates, counted column-wise
+        for strategy, (played, won) in self.data_collector.strategy_win_counts().items():
+            patterns['strategy_effectiveness'][strategy] = {'wins': won, 'games': played,
+                                                            'win_rate': won / played * 100}
         
         # Print analysis
         print(f"\n📍 Most Popular Opening Moves:")
-        for move, count in sorted(patterns['opening_moves'].items(), key=lambda x: x[1], reverse=True)[:5]:
-            percentage = count / len(self.data_collector.games_data) * 100
+        percent_per_game = 100 / num_games
+        for move, count in patterns['opening_moves'].most_common(5):
+            percentage = count * percent_per_game
             print(f"  Position {move}: {count} times ({percentage:.1f}%)")
         
         print(f"\n🎯 Strategy Win Rates:")
@@ -812,6 +1525,32 @@ class TicTacToeAI:
         
         return dict(patterns)
 
+GAMES_PER_WORKER_TASK = 1000  # Games per task when generate_training_data uses worker processes
+_WORKER_AI: Optional[TicTacToeAI] = None
+
+def _init_game_worker(q_table_x: LRUQTable, q_table_o: LRUQTable) -> None:
+    """Create the worker's TicTacToeAI with the parent's Q-tables"""
+    global _WORKER_AI
+    _WORKER_AI = TicTacToeAI()
+    _WORKER_AI.q_agent_x.q_table = q_table_x
+    _WORKER_AI.q_agent_o.q_table = q_table_o
+
+def _play_game_chunk(strategy_x: Strategy, strategy_o: Strategy, num_games: int, first_game_id: int,
+                     seed: int) -> List[GameRecord]:
+    """Play and record num_games games of one matchup in a worker process"""
+    ai = _WORKER_AI
+    ai.set_strategies(strategy_x, strategy_o)
+    ai._rng.seed(seed)
+    ai.data_collector = GameplayDataCollector()
+    ai.data_collector.current_game_id = first_game_id
+    repeat_first = is_deterministic(strategy_x) and is_deterministic(strategy_o)
+    for i in range(num_games):
+        if repeat_first and i:
+            ai.record_game_copy(ai.data_collector.games_data[0])
+        else:
+            ai.play_self_game(collect_data=True)
+    return ai.data_collector.games_data
+
 if __name__ == "__main__":
     print("🎮 AI vs AI Tic-Tac-Toe Gameplay & Training Data Generator")
     print("=" * 70)
@@ -857,8 +1596,18 @@ if __name__ == "__main__":
     print("-" * 40)
     
     learning_ai = TicTacToeAI()
-    print("Training Q-learning agent...")
-    learning_ai.train_q_learning_agent(episodes=200, opponent_strategy=Strategy.RANDOM)
+    episodes, opponent = 200, Strategy.RANDOM
+    # Trained tables are reused across runs with the same training and agent settings
+    agent_tags = dict.fromkeys((learning_ai.q_agent_x.settings_tag(), learning_ai.q_agent_o.settings_tag()))
+    q_table_prefix = os.path.join(Q_CACHE_DIR, f"q_table_{episodes}_{opponent.value}_{'_'.join(agent_tags)}")
+    if os.path.exists(f"{q_table_prefix}_x.json") and os.path.exists(f"{q_table_prefix}_o.json"):
+        print("Loading cached Q-learning tables...")
+        learning_ai.load_q_tables(q_table_prefix)
+    else:
+        print("Training Q-learning agent...")
+        learning_ai.train_q_learning_agent(episodes=episodes, opponent_strategy=opponent)
+        os.makedirs(Q_CACHE_DIR, exist_ok=True)
+        learning_ai.save_q_tables(q_table_prefix)
     
     # Test the trained agent and collect data
     print("\nTesting trained agent vs different strategies...")
@@ -897,7 +1646,7 @@ if __name__ == "__main__":
     print("\n📁 Generated Files:")
     print("  - training_data_[timestamp].csv")
     print("  - training_data_[timestamp].json")
-    print("  - q_table_x.json / q_table_o.json (if Q-learning used)")
+    print(f"  - {q_table_prefix}_x.json / {q_table_prefix}_o.json (cached Q-tables, delete to retrain)")
     
     print("\n🚀 Ready for Production Use:")
     print("  - Scale up games_per_pair for larger datasets")